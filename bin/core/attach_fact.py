@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
-import json, os, sys
+import json, mmap, os, pickle, sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 try:
@@ -8,7 +9,21 @@ except ImportError:
     print("ERROR: Missing PyYAML. Install with: python3 -m pip install --user pyyaml", file=sys.stderr)
     sys.exit(2)
 
-from reference_paths import resolve_active_srd_path
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+    if ijson.backend == "python":
+        ijson = None  # same C-backend-only rule as build_srd_index
+except ImportError:
+    ijson = None
+
+from build_srd_index import read_record
+from reference_paths import load_yaml_file, resolve_active_srd_path
+from safe_io import replace_write_bytes
 
 REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
 REF_CFG  = os.path.join(REPO_ROOT, "config", "reference_sources.yaml")
@@ -18,39 +33,73 @@ def atom_path() -> str:
     day = (os.getenv("BIZZAL_DAY") or "").strip() or datetime.now().strftime("%Y-%m-%d")
     return os.path.join(REPO_ROOT, "data", "atoms", "incoming", day + ".json")
 
+MMAP_MIN_BYTES = 256 * 1024
+
 def load_json(p):
+    if orjson is not None:
+        with open(p, "rb") as f:
+            # Large SRD files: parse straight from the page cache, no extra userspace copy
+            if os.fstat(f.fileno()).st_size >= MMAP_MIN_BYTES:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    with memoryview(mm) as view:
+                        return orjson.loads(view)
+            return orjson.loads(f.read())
     with open(p, "r", encoding="utf-8") as f:
         return json.load(f)
 
+# SRD files are read-only reference data: keep one pickle sidecar per file, rebuilt in place
+# when the (mtime, size) key stored inside it no longer matches.
+def load_srd_json(p):
+    st = os.stat(p)
+    sig = (st.st_mtime_ns, st.st_size)
+    cache = p + ".pkl"
+    try:
+        with open(cache, "rb") as f:
+            cached_sig, obj = pickle.load(f)
+        if cached_sig == sig:
+            return obj
+    except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError):
+        pass
+    obj = load_json(p)
+    try:
+        replace_write_bytes(cache, pickle.dumps((sig, obj), protocol=5))
+    except OSError:
+        pass  # read-only reference dir; serve uncached
+    return obj
+
 def load_yaml(p):
-    with open(p, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    return load_yaml_file(p)
 
 def atomic_write_json(p, obj):
-    tmp = p + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(obj, f, indent=2, ensure_ascii=False); f.write("\n")
-    os.replace(tmp, p)
+    if orjson is not None:
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    else:
+        data = (json.dumps(obj, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+    replace_write_bytes(p, data)
 
-def index_by_pk(records):
-    out = {}
+def fields_by_parent(records, pk):
+    out = []
     if isinstance(records, list):
         for r in records:
-            if isinstance(r, dict) and r.get("pk") is not None:
-                out[r["pk"]] = r
+            if not isinstance(r, dict):
+                continue
+            fields = r.get("fields") or {}
+            if fields.get("parent") == pk:
+                out.append(fields)
     return out
 
-def group_by_parent(records):
-    out = {}
-    if isinstance(records, list):
-        for r in records:
-            if not isinstance(r, dict): 
+# Stream join files so only rows for `pk` are materialized (full load without ijson).
+def load_children_for_parent(path, pk):
+    if ijson is None:
+        return fields_by_parent(load_srd_json(path), pk)
+    out = []
+    with open(path, "rb") as f:
+        for r in ijson.items(f, "item", use_float=True):
+            if not isinstance(r, dict):
                 continue
             fields = r.get("fields") or {}
-            parent = fields.get("parent")
-            if parent is None:
-                continue
-            out.setdefault(parent, []).append(r)
+            if fields.get("parent") == pk:
+                out.append(fields)
     return out
 
 def canonical_category(category: str) -> str:
@@ -64,9 +113,7 @@ def canonical_category(category: str) -> str:
     }
     return aliases.get((category or "").strip().lower(), (category or "").strip().lower())
 
-def main():
-    path = atom_path()
-    atom = load_json(path)
+def run(atom: dict) -> dict:
     category = canonical_category(atom.get("category"))
     picks = atom.get("picks") or {}
 
@@ -102,7 +149,8 @@ def main():
         sys.exit(4)
 
     base_path = os.path.join(active_dir, base_file)
-    base_rec = index_by_pk(load_json(base_path)).get(pk)
+    # pk -> byte-offset sidecar; parses a single record instead of the whole file
+    base_rec = read_record(base_path, pk)
     if not base_rec:
         print(f"ERROR: pk not found in {base_file}: {pk}", file=sys.stderr)
         sys.exit(5)
@@ -127,24 +175,19 @@ def main():
         action_path = os.path.join(active_dir, action_file)
         atk_path    = os.path.join(active_dir, atk_file)
 
-        traits_all  = load_json(trait_path)
-        actions_all = load_json(action_path)
-        atks_all    = load_json(atk_path)
-
-        traits = (group_by_parent(traits_all).get(pk) or [])
-        actions = (group_by_parent(actions_all).get(pk) or [])
-        attacks = (group_by_parent(atks_all).get(pk) or [])
-
+        # Independent reads: overlap I/O (and GIL-free parsing) across files.
         # Attach only fields (keep it lightweight)
-        fact["traits"] = [t.get("fields") or {} for t in traits]
-        fact["actions"] = [a.get("fields") or {} for a in actions]
-        fact["attacks"] = [x.get("fields") or {} for x in attacks]
+        join_paths = [trait_path, action_path, atk_path]
+        with ThreadPoolExecutor(max_workers=len(join_paths)) as ex:
+            fact["traits"], fact["actions"], fact["attacks"] = ex.map(
+                load_children_for_parent, join_paths, [pk] * len(join_paths)
+            )
 
     # Spell joins (optional files; attach only if present)
     if kind == "spell":
         def try_load(path):
             try:
-                return load_json(path)
+                return load_srd_json(path)
             except Exception:
                 return None
 
@@ -154,19 +197,21 @@ def main():
         sco_path = os.path.join(active_dir, sco_file)
         sl_path  = os.path.join(active_dir, sl_file)
 
-        sco_all = try_load(sco_path)
-        sl_all  = try_load(sl_path)
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            sco_all, sl_all = ex.map(try_load, [sco_path, sl_path])
 
         # These datasets usually reference spell by parent; if not, we'll just skip.
         if isinstance(sco_all, list):
-            sco = (group_by_parent(sco_all).get(pk) or [])
-            fact["casting_options"] = [x.get("fields") or {} for x in sco]
+            fact["casting_options"] = fields_by_parent(sco_all, pk)
         if isinstance(sl_all, list):
-            sl = (group_by_parent(sl_all).get(pk) or [])
-            fact["spell_lists"] = [x.get("fields") or {} for x in sl]
+            fact["spell_lists"] = fields_by_parent(sl_all, pk)
 
     atom["fact"] = fact
-    atomic_write_json(path, atom)
+    return atom
+
+def main():
+    path = atom_path()
+    atomic_write_json(path, run(load_json(path)))
     print(path)
 
 if __name__ == "__main__":
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+import json, os, sys
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+    if ijson.backend == "python":
+        ijson = None  # pure-Python backend streams ~35x slower than a full orjson parse
+except ImportError:
+    ijson = None
+
+from reference_paths import resolve_active_srd_path
+from safe_io import replace_write_bytes
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+REF_CFG  = os.path.join(REPO_ROOT, "config", "reference_sources.yaml")
+
+# Base files looked up / sampled by pk (attach_fact, lookup_pick, fill_picks)
+BASE_SOURCES = {
+    "items": "Item.json",
+    "spells": "Spell.json",
+    "creatures": "Creature.json",
+    "rules": "Rule.json",
+    "classes": "CharacterClass.json",
+}
+
+
+# Sidecar is JSON, but not named *.json so inventory scans skip it.
+def index_path(path: str) -> str:
+    return path + ".pkidx"
+
+def file_sig(path: str) -> list:
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+def scan_offsets(path: str) -> tuple[dict, list]:
+    # One full scan of a Django fixture array -> ({pk: [byte_offset, byte_length]}, [pk, ...])
+    with open(path, "rb") as f:
+        raw = f.read()
+    text = raw.decode("utf-8")
+    dec = json.JSONDecoder()
+    out = {}
+    pks = []
+
+    body = text.lstrip("\ufeff \t\r\n")
+    if not body.startswith("["):
+        raise SystemExit(f"ERROR: SRD fixture {path} is not a JSON array")
+    i = len(text) - len(body) + 1
+    char_pos = 0
+    byte_pos = 0
+    n = len(text)
+    while i < n:
+        while i < n and text[i] in " \t\r\n,":
+            i += 1
+        if i >= n or text[i] == "]":
+            break
+        try:
+            rec, end = dec.raw_decode(text, i)
+        except ValueError as e:
+            raise SystemExit(f"ERROR: SRD fixture {path} is not valid JSON: {e}")
+        byte_pos += len(text[char_pos:i].encode("utf-8"))
+        length = len(text[i:end].encode("utf-8"))
+        if isinstance(rec, dict) and rec.get("pk") is not None:
+            out[str(rec["pk"])] = [byte_pos, length]
+            pks.append(rec["pk"])
+        byte_pos += length
+        char_pos = end
+        i = end
+    return out, pks
+
+def build_index(path: str) -> dict:
+    sig = file_sig(path)
+    idx, pks = scan_offsets(path)
+    sidecar = {"sig": sig, "index": idx, "pks": pks}
+    out = index_path(path)
+    try:
+        replace_write_bytes(out, json.dumps(sidecar).encode("utf-8"))
+    except OSError:
+        pass  # read-only reference dir; index stays in-memory
+    return sidecar
+
+_SIDECARS: dict = {}
+
+def load_sidecar(path: str) -> dict:
+    # Parsed once per process per fixture version; orjson parses the sidecar bytes directly.
+    sig = file_sig(path)
+    cached = _SIDECARS.get(path)
+    if cached is not None and cached.get("sig") == sig:
+        return cached
+    try:
+        with open(index_path(path), "rb") as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw.decode("utf-8"))
+        if data.get("sig") != sig or "pks" not in data:
+            data = build_index(path)
+    except (OSError, ValueError, AttributeError):
+        data = build_index(path)
+    _SIDECARS[path] = data
+    return data
+
+def load_index(path: str) -> dict:
+    return load_sidecar(path).get("index") or {}
+
+# All pks in file order (original types), for sampling without parsing the fixture.
+def load_pks(path: str) -> list:
+    return load_sidecar(path).get("pks") or []
+
+# Stream fixture rows so only one record is materialized at a time (full load without ijson).
+def iter_records(path: str):
+    if ijson is None:
+        with open(path, "rb") as f:
+            raw = f.read()
+        yield from (orjson.loads(raw) if orjson is not None else json.loads(raw.decode("utf-8")))
+        return
+    with open(path, "rb") as f:
+        yield from ijson.items(f, "item", use_float=True)
+
+def derived_index_path(path: str, tag: str) -> str:
+    return f"{path}.{tag}.pkidx"
+
+# pks whose record passes keep(rec), in file order. Cached beside the fixture under `tag` and keyed
+# by the same sig as the .pkidx sidecar; bump the tag when the predicate changes.
+def load_derived_pks(path: str, tag: str, keep) -> list:
+    sig = file_sig(path)
+    out = derived_index_path(path, tag)
+    try:
+        with open(out, "rb") as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw.decode("utf-8"))
+        if data.get("sig") == sig and isinstance(data.get("pks"), list):
+            return data["pks"]
+    except (OSError, ValueError, AttributeError):
+        pass
+    pks = [
+        rec["pk"] for rec in iter_records(path)
+        if isinstance(rec, dict) and rec.get("pk") is not None and keep(rec)
+    ]
+    try:
+        replace_write_bytes(out, json.dumps({"sig": sig, "pks": pks}).encode("utf-8"))
+    except OSError:
+        pass  # read-only reference dir; recomputed next run
+    return pks
+
+def read_record(path: str, pk):
+    entry = load_index(path).get(str(pk))
+    if not entry:
+        return None
+    off, length = entry
+    with open(path, "rb") as f:
+        f.seek(off)
+        data = f.read(length)
+    rec = orjson.loads(data) if orjson is not None else json.loads(data.decode("utf-8"))
+    # Guard against a pk collision after str() normalization
+    if rec.get("pk") != pk:
+        return None
+    return rec
+
+def main():
+    active_dir, cfg = resolve_active_srd_path(REPO_ROOT, REF_CFG)
+    if not active_dir or not os.path.isdir(active_dir):
+        print(f"ERROR: Bad active_srd_path in {REF_CFG}: {active_dir}", file=sys.stderr)
+        sys.exit(2)
+
+    sources = cfg.get("sources", {}) if isinstance(cfg, dict) else {}
+    for key, default_file in BASE_SOURCES.items():
+        fname = (sources.get(key) or {}).get("file", default_file)
+        path = os.path.join(active_dir, fname)
+        if not os.path.isfile(path):
+            print(f"[build_srd_index] skip (missing): {fname}")
+            continue
+        sidecar = build_index(path)
+        print(f"[build_srd_index] {fname}: {len(sidecar['index'])} pks -> {index_path(path)}")
+        if key == "creatures":
+            # Prebuild the moral_choice pk list so the pickers never stream the fixture on a cold cache.
+            # Imported here, not at the top: creature_filters imports this module for load_derived_pks.
+            from creature_filters import MORAL_CHOICE_TAG, moral_choice_pks
+            print(f"[build_srd_index] {fname}: {len(moral_choice_pks(path))} moral_choice pks -> {derived_index_path(path, MORAL_CHOICE_TAG)}")
+
+if __name__ == "__main__":
+    main()
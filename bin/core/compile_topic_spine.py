@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+import sys
+
+from make_atom import TOPIC_SPINE, TOPIC_SPINE_JSON, parse_topic_spine_yaml, write_topic_spine_json, yaml_module
+
+# Precompile config/topic_spine.yaml -> config/topic_spine.json so make_atom skips the YAML parse.
+def main():
+    if yaml_module() is None:
+        print("ERROR: Missing PyYAML. Install with: python3 -m pip install --user pyyaml", file=sys.stderr)
+        sys.exit(2)
+    try:
+        spine = parse_topic_spine_yaml()
+    except Exception as exc:
+        print(f"ERROR: Could not parse {TOPIC_SPINE}: {exc}", file=sys.stderr)
+        sys.exit(3)
+    if not isinstance(spine, dict) or not write_topic_spine_json(spine):
+        print(f"ERROR: {TOPIC_SPINE} does not round-trip through JSON; not compiled", file=sys.stderr)
+        sys.exit(4)
+    print(TOPIC_SPINE_JSON)
+
+if __name__ == "__main__":
+    main()
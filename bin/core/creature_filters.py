@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+import re
+
+from build_srd_index import load_derived_pks
+
+# Sidecar tag for moral_choice_pks; bump when weak_moral_choice_candidate changes.
+MORAL_CHOICE_TAG = "creature_filters-moral1"
+
+# Substring match, same as `any(tok in name ...)`, but one compiled scan per name.
+_MUNDANE_MOUNT_RE = re.compile(r"riding horse|draft horse|pony|mule|donkey|camel|ox|goat|mastiff")
+_HIGH_FANTASY_RE = re.compile(r"nightmare|pegasus|unicorn")
+
+
+def parse_cr(value) -> float:
+    if value is None:
+        return 0.0
+    s = str(value).strip().lower()
+    if not s:
+        return 0.0
+    try:
+        if "/" in s:
+            a, b = s.split("/", 1)
+            return float(a) / float(b)
+        return float(s)
+    except Exception:
+        return 0.0
+
+
+def weak_moral_choice_candidate(rec: dict) -> bool:
+    fields = (rec or {}).get("fields") or {}
+    name = str(fields.get("name") or "").strip().lower()
+    ctype = str(fields.get("type") or fields.get("creature_type") or "").strip().lower()
+    cr = parse_cr(fields.get("challenge_rating") or fields.get("cr"))
+
+    if not name:
+        return False
+    if _MUNDANE_MOUNT_RE.search(name) and not _HIGH_FANTASY_RE.search(name):
+        return True
+    if ctype in ("beast", "animal") and cr <= 0.25:
+        return True
+    if cr == 0.0:
+        return True
+    return False
+
+
+# Creature pks that survive the moral_choice filter, cached beside the fixture.
+# Shared by fill_picks and pick_creature so both read the same sidecar.
+def moral_choice_pks(path: str) -> list:
+    return load_derived_pks(path, MORAL_CHOICE_TAG, lambda rec: not weak_moral_choice_candidate(rec))
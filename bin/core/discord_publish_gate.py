@@ -1,14 +1,89 @@
 #!/usr/bin/env python3
 import argparse
+import atexit
+import functools
 import json
+import time
 import os
+import re
 import shlex
 import socket
 import subprocess
 import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from urllib import error, parse, request
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import urllib3
+except ImportError:
+    urllib3 = None
+
+from safe_io import safe_write_json
+
+USER_AGENT = "BizzalPublishGate/1.0"
+DISCORD_MAX_EMBEDS = 10
+DISCORD_PAGE_LIMIT = 100
+DISCORD_MAX_PAGES = 10
+PUBLISH_OUTPUT_TAIL_CHARS = 4096
+STATE_LOCK_STALE_SECONDS = 3600
+# A "publishing" entry with no recorded result after this long belongs to a check run that died
+# mid-upload: check expires it as approved_publish_failed and request may ask for the day again.
+PUBLISH_STALE_SECONDS = 2 * 3600
+FINAL_STATUSES = frozenset({"rejected", "published", "approved_publish_failed"})
+
+_HOSTNAME = socket.gethostname()
+
+_CMD_ALIASES = {
+    "approve": "approve",
+    "approved": "approve",
+    "reject": "reject",
+    "rejected": "reject",
+}
+_CMD_PREFIXES = ("approve", "reject")
+_WEBHOOK_RE = re.compile(r"^https://(?:ptb\.|canary\.)?discord\.com/api/webhooks/\d+/[A-Za-z0-9_\-]+/?(?:\?\S*)?$")
+_DAY_FILE_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})\.json$")
+_WS_RE = re.compile(r"\s+")
+
+
+def _make_httpx_client():
+    if httpx is None:
+        return None
+    try:
+        client = httpx.Client(http2=True, timeout=30.0)
+    except ImportError:
+        # http2=True needs the optional h2 package; keep pooled HTTP/1.1 otherwise.
+        client = httpx.Client(timeout=30.0)
+    atexit.register(client.close)
+    return client
+
+
+# One keep-alive session per process so repeated Discord calls skip the TLS handshake.
+# Preference: httpx (HTTP/2 when h2 is installed) -> urllib3 pool -> urllib.request.
+_HTTPX = _make_httpx_client()
+_POOL = (
+    urllib3.PoolManager(maxsize=4, retries=urllib3.Retry(3, backoff_factor=0.2))
+    if _HTTPX is None and urllib3 is not None
+    else None
+)
+
 
 def now_utc() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
@@ -29,32 +104,104 @@ def parse_utc_timestamp(value: str) -> datetime | None:
         return None
 
 
+def json_loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def json_dumps_bytes(obj) -> bytes:
+    return orjson.dumps(obj) if orjson is not None else json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
 def load_json(path: str) -> dict:
-    if not os.path.isfile(path):
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
         return {}
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            obj = json.load(f)
-            return obj if isinstance(obj, dict) else {}
-    except Exception:
+        obj = json_loads(data)
+    except ValueError:
         return {}
+    return obj if type(obj) is dict else {}
 
 
 def save_json(path: str, obj: dict):
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    tmp = path + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(obj, f, indent=2, ensure_ascii=False)
-        f.write("\n")
-    os.replace(tmp, path)
+    safe_write_json(path, obj)
+
+
+# Finalized decisions move from the hot state file to an append-only JSONL archive,
+# so the state file only grows with open approvals.
+def archive_path_for(state_path: str) -> str:
+    return os.path.splitext(state_path)[0] + "_archive.jsonl"
+
+
+# Sidecar {day: {content_id, status}} kept in step with the archive, so request looks a day up
+# without decoding every archived line; rebuilt by one scan whenever the archive's stat drifts.
+def archive_index_path(path: str) -> str:
+    return path + ".idx.json"
+
+
+def _archive_stamp(path: str) -> list | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _scan_archive(path: str) -> dict:
+    days = {}
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    obj = json_loads(line)
+                except ValueError:
+                    continue
+                if isinstance(obj, dict) and obj.get("day"):
+                    days[str(obj["day"])] = {"content_id": obj.get("content_id"), "status": obj.get("status")}
+    except OSError:
+        pass
+    return days
+
+
+def load_archive_index(path: str) -> dict:
+    stamp = _archive_stamp(path)
+    if stamp is None:
+        return {}
+    idx = load_json(archive_index_path(path))
+    days = idx.get("days")
+    if idx.get("stamp") == stamp and isinstance(days, dict):
+        return days
+    days = _scan_archive(path)
+    save_json(archive_index_path(path), {"stamp": stamp, "days": days})
+    return days
+
+
+def append_archive(path: str, entries: list[dict]):
+    if not entries:
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    days = load_archive_index(path)
+    with open(path, "ab") as f:
+        f.write(b"".join(json_dumps_bytes(e) + b"\n" for e in entries))
+    for e in entries:
+        days[str(e.get("day"))] = {"content_id": e.get("content_id"), "status": e.get("status")}
+    save_json(archive_index_path(path), {"stamp": _archive_stamp(path), "days": days})
+
+
+def archived_entry(path: str, day: str) -> dict | None:
+    found = load_archive_index(path).get(day)
+    return dict(found, day=day) if isinstance(found, dict) else None
 
 
 def atom_for_day(repo_root: str, day: str) -> tuple[str, dict]:
     path = os.path.join(repo_root, "data", "atoms", "validated", f"{day}.json")
     if not os.path.isfile(path):
         raise FileNotFoundError(f"validated atom missing: {path}")
-    with open(path, "r", encoding="utf-8") as f:
-        obj = json.load(f)
+    with open(path, "rb") as f:
+        obj = json_loads(f.read())
     return path, obj
 
 
@@ -62,105 +209,142 @@ def latest_validated_day(repo_root: str) -> str | None:
     validated_dir = os.path.join(repo_root, "data", "atoms", "validated")
     if not os.path.isdir(validated_dir):
         return None
-    days: list[str] = []
-    for name in os.listdir(validated_dir):
-        if not name.endswith(".json"):
-            continue
-        day = name[:-5]
-        try:
-            datetime.strptime(day, "%Y-%m-%d")
-        except ValueError:
-            continue
-        days.append(day)
-    if not days:
-        return None
-    return sorted(days)[-1]
+    # YYYY-MM-DD sorts lexicographically in date order, so a running max is enough.
+    best = None
+    with os.scandir(validated_dir) as it:
+        for entry in it:
+            m = _DAY_FILE_RE.match(entry.name)
+            if m and (best is None or m.group(1) > best):
+                best = m.group(1)
+    return best
 
 
 def short(text: str, n: int) -> str:
-    t = " ".join((text or "").split())
+    if not text:
+        return ""
+    # Already-clean short text (no tabs/newlines/odd spaces) is returned as-is.
+    if len(text) <= n and text.isprintable() and "  " not in text and text[0] != " " and text[-1] != " ":
+        return text
+    t = _WS_RE.sub(" ", text).strip()
     if len(t) <= n:
         return t
     cut = t[: n - 1]
     idx = cut.rfind(" ")
     if idx > 0:
         cut = cut[:idx]
-    return cut + "…"
+    return f"{cut}…"
 
 
-def webhook_post_json(url: str, payload: dict, wait: bool = False) -> dict:
-    if wait:
-        sep = "&" if "?" in url else "?"
-        url = f"{url}{sep}wait=true"
-    body = json.dumps(payload).encode("utf-8")
-    req = request.Request(
-        url,
-        data=body,
-        headers={"Content-Type": "application/json", "User-Agent": "BizzalPublishGate/1.0"},
-        method="POST",
-    )
+class DiscordHTTPError(Exception):
+    def __init__(self, code: int, body: str):
+        super().__init__(f"http={code}")
+        self.code = code
+        self.body = body
+
+
+# Returns the raw response body (b"" for 204); only error bodies are decoded to str.
+def http_request(method: str, url: str, headers: dict, body: bytes | None = None) -> bytes:
+    if _HTTPX is not None:
+        resp = _HTTPX.request(method, url, content=body, headers=headers)
+        if resp.status_code >= 400:
+            raise DiscordHTTPError(resp.status_code, resp.text)
+        return b"" if resp.status_code == 204 else resp.content
+
+    if _POOL is not None:
+        resp = _POOL.request(method, url, body=body, headers=headers, timeout=30.0)
+        if resp.status >= 400:
+            raise DiscordHTTPError(resp.status, resp.data.decode("utf-8", errors="replace"))
+        return b"" if resp.status == 204 else resp.data
+
+    req = request.Request(url, data=body, headers=headers, method=method)
     try:
         with request.urlopen(req, timeout=30) as resp:
-            raw = resp.read().decode("utf-8")
+            if resp.status == 204:
+                return b""
+            return resp.read()
     except error.HTTPError as exc:
-        body = ""
+        err_body = ""
         try:
-            body = exc.read().decode("utf-8", errors="replace")
+            err_body = exc.read().decode("utf-8", errors="replace")
         except Exception:
-            body = ""
-        raise RuntimeError(f"discord webhook rejected: http={exc.code} body={body or '(empty)'}")
-    if not raw.strip():
+            err_body = ""
+        raise DiscordHTTPError(exc.code, err_body)
+
+
+def webhook_post_json(url: str, payload: dict, wait: bool = False) -> dict:
+    if wait:
+        sep = "&" if "?" in url else "?"
+        url = f"{url}{sep}wait=true"
+    body = json_dumps_bytes(payload)
+    try:
+        raw = http_request(
+            "POST",
+            url,
+            {"Content-Type": "application/json", "User-Agent": USER_AGENT},
+            body,
+        )
+    except DiscordHTTPError as exc:
+        raise RuntimeError(f"discord webhook rejected: http={exc.code} body={exc.body or '(empty)'}")
+    if not raw:
         return {}
     try:
-        obj = json.loads(raw)
+        obj = json_loads(raw)
         return obj if isinstance(obj, dict) else {}
     except Exception:
         return {}
 
 
-def discord_get_messages(bot_token: str, channel_id: str, limit: int = 50) -> list:
-    qs = parse.urlencode({"limit": max(1, min(limit, 100))})
+def discord_get_messages(bot_token: str, channel_id: str, limit: int = 50, after: str = "") -> list:
+    query = {"limit": max(1, min(limit, 100))}
+    if after:
+        query["after"] = after
+    qs = parse.urlencode(query)
     url = f"https://discord.com/api/v10/channels/{channel_id}/messages?{qs}"
-    req = request.Request(
-        url,
-        headers={
-            "Authorization": f"Bot {bot_token}",
-            "User-Agent": "BizzalPublishGate/1.0",
-        },
-        method="GET",
-    )
     try:
-        with request.urlopen(req, timeout=30) as resp:
-            raw = resp.read().decode("utf-8")
-    except error.HTTPError as exc:
-        body = ""
-        try:
-            body = exc.read().decode("utf-8", errors="replace")
-        except Exception:
-            body = ""
-        raise RuntimeError(f"discord get messages rejected: http={exc.code} body={body or '(empty)'}")
-    obj = json.loads(raw)
+        raw = http_request(
+            "GET",
+            url,
+            {
+                "Authorization": f"Bot {bot_token}",
+                "User-Agent": USER_AGENT,
+            },
+        )
+    except DiscordHTTPError as exc:
+        raise RuntimeError(f"discord get messages rejected: http={exc.code} body={exc.body or '(empty)'}")
+    obj = json_loads(raw)
     return obj if isinstance(obj, list) else []
 
 
+def max_snowflake(messages: list) -> int:
+    return max((int(m["id"]) for m in messages if str(m.get("id") or "").isdigit()), default=0)
+
+
+def discord_get_new_messages(bot_token: str, channel_id: str, after: str) -> tuple[list, int]:
+    # Snowflake ids increase over time, so page forward with after=<newest seen> until a short page.
+    # Without a cursor (first run) only the latest page is read.
+    messages = discord_get_messages(bot_token, channel_id, limit=DISCORD_PAGE_LIMIT, after=after)
+    newest = max(max_snowflake(messages), int(after or 0))
+    page = messages
+    pages = 1
+    while after and len(page) >= DISCORD_PAGE_LIMIT and pages < DISCORD_MAX_PAGES:
+        page = discord_get_messages(bot_token, channel_id, limit=DISCORD_PAGE_LIMIT, after=str(newest))
+        messages.extend(page)
+        newest = max(newest, max_snowflake(page))
+        pages += 1
+    return messages, newest
+
+
 def parse_approval_command(content: str) -> tuple[str, str] | None:
-    txt = (content or "").strip().lower()
-    parts = txt.split()
-    if not parts:
+    txt = (content or "").lstrip().lower()
+    # Most channel chatter is not a command; skip it before allocating a split list.
+    if not txt.startswith(_CMD_PREFIXES):
         return None
-    cmd = parts[0]
-    cmd_alias = {
-        "approve": "approve",
-        "approved": "approve",
-        "reject": "reject",
-        "rejected": "reject",
-    }.get(cmd)
+    parts = txt.split(None, 2)
+    cmd_alias = _CMD_ALIASES.get(parts[0])
     if not cmd_alias:
         return None
     arg = parts[1] if len(parts) >= 2 else ""
-    if cmd_alias in {"approve", "reject"}:
-        return cmd_alias, arg
-    return None
+    return cmd_alias, arg
 
 
 def normalize_webhook_url(url: str) -> str:
@@ -188,47 +372,137 @@ def looks_like_placeholder_webhook(url: str) -> bool:
     if "..." in u or "YOUR_" in u.upper() or "REPLACE" in u.upper():
         return True
 
-    try:
-        parsed = parse.urlparse(u)
-    except Exception:
-        return True
+    return not _WEBHOOK_RE.match(u)
+
+
+def notice(day: str, text: str) -> dict:
+    return {"title": f"Decision {day}", "description": text}
 
-    if parsed.scheme != "https":
-        return True
-    if not parsed.netloc.endswith("discord.com"):
-        return True
-    if "/api/webhooks/" not in (parsed.path or ""):
-        return True
 
-    return False
+def post_notices(webhook_url: str, notices: list[dict]):
+    # One embed per decision (a day's approve/publish lines merged), one webhook POST per
+    # check cycle; Discord caps a message at 10 embeds.
+    embeds: list[dict] = []
+    for n in notices:
+        if embeds and embeds[-1]["title"] == n["title"]:
+            embeds[-1]["description"] += "\n" + n["description"]
+        else:
+            embeds.append(dict(n))
+    for i in range(0, len(embeds), DISCORD_MAX_EMBEDS):
+        try:
+            webhook_post_json(
+                webhook_url,
+                {"username": "Bizzal Publish Gate", "embeds": embeds[i : i + DISCORD_MAX_EMBEDS]},
+                wait=False,
+            )
+        except Exception:
+            pass
+
+
+# Several approvals can publish in one check cycle; tokenize/stat the command once.
+@functools.lru_cache(maxsize=4)
+def _split_cmd(cmd_env: str) -> tuple[str, ...]:
+    return tuple(shlex.split(cmd_env))
+
+
+@functools.lru_cache(maxsize=4)
+def _default_publish_cmd(repo_root: str) -> str:
+    path = os.path.join(repo_root, "bin", "upload", "upload_youtube.py")
+    return path if os.path.exists(path) else ""
+
+
+def _drain_tail(stream, tail: deque, cap: int):
+    size = 0
+    for chunk in iter(lambda: stream.read(8192), ""):
+        tail.append(chunk)
+        size += len(chunk)
+        while size - len(tail[0]) >= cap:
+            size -= len(tail.popleft())
+    stream.close()
 
 
 def run_publish_command(repo_root: str, day: str) -> tuple[int, str]:
     cmd_env = os.getenv("BIZZAL_PUBLISH_CMD", "").strip()
     if cmd_env:
         try:
-            cmd = shlex.split(cmd_env)
+            cmd = list(_split_cmd(cmd_env))
         except ValueError as exc:
             return 13, f"invalid BIZZAL_PUBLISH_CMD quoting: {exc}"
-    elif os.path.exists(os.path.join(repo_root, "bin", "upload", "upload_youtube.py")):
-        cmd = [os.path.join(repo_root, "bin", "upload", "upload_youtube.py")]
+    elif _default_publish_cmd(repo_root):
+        cmd = [_default_publish_cmd(repo_root)]
     else:
         return 10, "no publish command available"
 
     try:
         env = os.environ.copy()
         env["BIZZAL_DAY"] = day
-        proc = subprocess.run(cmd, cwd=repo_root, capture_output=True, text=True, env=env)
+        proc = subprocess.Popen(
+            cmd,
+            cwd=repo_root,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="replace",
+            env=env,
+        )
     except FileNotFoundError as exc:
         return 11, f"publish command executable not found: {exc}"
     except Exception as exc:
         return 12, f"publish command failed to launch: {exc}"
 
-    out = ((proc.stdout or "") + "\n" + (proc.stderr or "")).strip()
-    return proc.returncode, out
+    # One interleaved stream; keep only its tail so long publish logs don't sit in memory.
+    tail: deque = deque()
+    _drain_tail(proc.stdout, tail, PUBLISH_OUTPUT_TAIL_CHARS)
+    rc = proc.wait()
+
+    out = "".join(tail)[-PUBLISH_OUTPUT_TAIL_CHARS:].strip()
+    return rc, out
+
+
+@contextmanager
+def locked_state(state_path: str):
+    # Serialize state read-modify-write across overlapping request/check runs (cron + manual).
+    os.makedirs(os.path.dirname(state_path), exist_ok=True)
+    lock_path = state_path + ".lock"
+    if fcntl is not None:
+        fd = os.open(lock_path, os.O_CREAT | os.O_RDWR, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+        return
+
+    # No flock (non-POSIX): exclusive-create a marker file; break it if a crashed run left it behind.
+    marker = state_path + ".lockfile"
+    while True:
+        try:
+            fd = os.open(marker, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(marker) > STATE_LOCK_STALE_SECONDS:
+                    os.remove(marker)
+                    continue
+            except OSError:
+                continue
+            time.sleep(0.2)
+    try:
+        yield
+    finally:
+        os.close(fd)
+        os.remove(marker)
 
 
 def request_mode(repo_root: str, day: str, state_path: str, webhook_url: str, force: bool) -> int:
+    with locked_state(state_path):
+        return _request_mode(repo_root, day, state_path, webhook_url, force)
+
+
+def _request_mode(repo_root: str, day: str, state_path: str, webhook_url: str, force: bool) -> int:
     webhook_url = normalize_webhook_url(webhook_url)
     if not webhook_url:
         print("ERROR: missing BIZZAL_DISCORD_WEBHOOK_URL", file=sys.stderr)
@@ -263,8 +537,8 @@ def request_mode(repo_root: str, day: str, state_path: str, webhook_url: str, fo
 
     state = load_json(state_path)
     approvals = state.setdefault("approvals", {})
-    existing = approvals.get(day)
-    if isinstance(existing, dict) and existing.get("content_id") == content_id and existing.get("status") in {"pending", "approved", "published"} and not force:
+    existing = approvals.get(day) or archived_entry(archive_path_for(state_path), day)
+    if isinstance(existing, dict) and existing.get("content_id") == content_id and existing.get("status") in {"pending", "approved", "publishing", "published"} and not publish_stale(existing) and not force:
         print(f"[discord_publish_gate] request exists day={day} status={existing.get('status')} content_id={content_id}")
         return 0
 
@@ -273,6 +547,7 @@ def request_mode(repo_root: str, day: str, state_path: str, webhook_url: str, fo
     hook = short(script.get("hook") or "", 220)
     body = short(script.get("body") or "", 340)
     cta = short(script.get("cta") or "", 180)
+    requested_utc = now_utc()
 
     payload = {
         "username": "Bizzal Publish Gate",
@@ -302,7 +577,7 @@ def request_mode(repo_root: str, day: str, state_path: str, webhook_url: str, fo
                     {"name": "Body", "value": body or "(empty)", "inline": False},
                     {"name": "CTA", "value": cta or "(empty)", "inline": False},
                 ],
-                "footer": {"text": f"host={socket.gethostname()} utc={now_utc()}"},
+                "footer": {"text": f"host={_HOSTNAME} utc={requested_utc}"},
             }
         ],
     }
@@ -320,7 +595,7 @@ def request_mode(repo_root: str, day: str, state_path: str, webhook_url: str, fo
         "category": category,
         "angle": angle,
         "status": "pending",
-        "requested_utc": now_utc(),
+        "requested_utc": requested_utc,
         "request_message_id": msg_id,
     }
     save_json(state_path, state)
@@ -328,29 +603,135 @@ def request_mode(repo_root: str, day: str, state_path: str, webhook_url: str, fo
     return 0
 
 
-def check_mode(repo_root: str, state_path: str, bot_token: str, channel_id: str, approve_users: set[str], webhook_url: str, publish: bool) -> int:
+def publish_stale(entry: dict, now: datetime | None = None) -> bool:
+    if entry.get("status") != "publishing":
+        return False
+    started = parse_utc_timestamp(str(entry.get("publishing_started_at") or ""))
+    if started is None:
+        return True
+    now = now or datetime.now(timezone.utc)
+    return (now - started).total_seconds() > PUBLISH_STALE_SECONDS
+
+
+def expire_stale_publishing(approvals: dict, notices: list[dict]) -> bool:
+    changed = False
+    for day, entry in approvals.items():
+        if not isinstance(entry, dict) or not publish_stale(entry):
+            continue
+        entry["status"] = "approved_publish_failed"
+        entry["publish_rc"] = None
+        entry["publish_output"] = f"no publish result recorded within {PUBLISH_STALE_SECONDS}s (check run died mid-upload?)"
+        print(f"[discord_publish_gate] expired stale publish day={day} started={entry.get('publishing_started_at')}")
+        notices.append(notice(day, f"❌ Publish for `{day}` (`{entry.get('content_id')}`) never reported back; marked failed. Re-request to retry."))
+        changed = True
+    return changed
+
+
+def check_mode(repo_root: str, state_path: str, bot_token: str, channel_id: str, approve_users: frozenset[str], webhook_url: str, publish: bool) -> int:
+    # The lock covers state read-modify-writes only. Uploads run unlocked with their entries
+    # parked in "publishing", so overlapping checks don't queue behind a minutes-long publish
+    # and can't pick the same day up again.
+    with locked_state(state_path):
+        rc, to_publish = _check_mode(state_path, bot_token, channel_id, approve_users, webhook_url, publish)
+    if rc != 0 or not to_publish:
+        return rc
+
+    results = [(day, content_id, *run_publish_command(repo_root, day)) for day, content_id in to_publish]
+
+    with locked_state(state_path):
+        _record_publish_results(state_path, webhook_url, results)
+    return 0
+
+
+def _finish_cycle(state_path: str, state: dict, approvals: dict, webhook_url: str, notices: list[dict], changed: bool):
+    # Notice POSTs go out on a worker (in order) while the archive/state writes happen here;
+    # leaving the block waits for them, so the cycle costs max(RTT, disk) rather than the sum.
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        if webhook_url and notices:
+            ex.submit(post_notices, webhook_url, notices)
+
+        finalized = [d for d, v in approvals.items() if isinstance(v, dict) and v.get("status") in FINAL_STATUSES]
+        if finalized:
+            entries = []
+            for d in finalized:
+                entry = approvals.pop(d)
+                entry.setdefault("day", d)
+                entries.append(entry)
+            append_archive(archive_path_for(state_path), entries)
+            changed = True
+
+        if changed:
+            state["approvals"] = approvals
+            save_json(state_path, state)
+
+
+def _record_publish_results(state_path: str, webhook_url: str, results: list[tuple]):
+    # State is re-read: other runs may have saved while the uploads ran unlocked.
     state = load_json(state_path)
     approvals = state.get("approvals") or {}
+    changed = False
+    notices: list[dict] = []
+    for day, content_id, rc, output in results:
+        entry = approvals.get(day)
+        if not isinstance(entry, dict) or entry.get("status") != "publishing":
+            # expired as stale or re-requested mid-upload; leave the newer state alone
+            print(f"[discord_publish_gate] publish result day={day} rc={rc} not recorded: entry no longer publishing", file=sys.stderr)
+            continue
+        entry["publish_rc"] = rc
+        entry["publish_output"] = short(output, 800)
+        if rc == 0:
+            entry["status"] = "published"
+            print(f"[discord_publish_gate] approved+pushed day={day} by={entry.get('decision_by')}")
+            notices.append(notice(day, f"🎉 Publish complete for `{day}` (`{content_id}`)."))
+        else:
+            entry["status"] = "approved_publish_failed"
+            print(f"[discord_publish_gate] approved but publish failed day={day} rc={rc}")
+            notices.append(notice(day, f"❌ Publish failed for `{day}` (`{content_id}`), rc={rc}. Check logs."))
+        approvals[day] = entry
+        changed = True
+    _finish_cycle(state_path, state, approvals, webhook_url, notices, changed)
+
+
+# Returns (rc, [(day, content_id), ...] approved and marked "publishing" for check_mode to upload).
+def _check_mode(state_path: str, bot_token: str, channel_id: str, approve_users: frozenset[str], webhook_url: str, publish: bool) -> tuple[int, list[tuple[str, str]]]:
+    state = load_json(state_path)
+    approvals = state.get("approvals") or {}
+    expired: list[dict] = []
+    if expire_stale_publishing(approvals, expired):
+        _finish_cycle(state_path, state, approvals, webhook_url, expired, True)
     pending_days = [d for d, v in approvals.items() if isinstance(v, dict) and v.get("status") == "pending"]
     if not pending_days:
         print("[discord_publish_gate] no pending approvals")
-        return 0
+        return 0, []
 
     if not bot_token or not channel_id:
         print("ERROR: missing bot token/channel id for approval check", file=sys.stderr)
-        return 2
+        return 2, []
 
+    # Only fetch messages newer than the last poll, tracked per channel.
+    cursors = state.setdefault("discord_cursor", {})
+    last_seen = str(cursors.get(channel_id) or "")
     try:
-        messages = discord_get_messages(bot_token, channel_id, limit=80)
+        messages, newest_id = discord_get_new_messages(bot_token, channel_id, last_seen)
     except Exception as exc:
         print(f"ERROR: failed to read discord channel messages: {exc}", file=sys.stderr)
-        return 3
+        return 3, []
+
+    cursor_moved = newest_id > int(last_seen or 0)
+    if cursor_moved:
+        cursors[channel_id] = str(newest_id)
+
+    restrict_users = bool(approve_users)
+    # day -> lowercased content_id; days are already lowercase YYYY-MM-DD
+    pending_meta = {d: str(approvals[d].get("content_id") or "").lower() for d in pending_days}
 
     changed = False
+    notices: list[dict] = []
+    to_publish: list[tuple[str, str]] = []
     for msg in messages:
         author = msg.get("author") or {}
         uid = str(author.get("id") or "")
-        if approve_users and uid not in approve_users:
+        if restrict_users and uid not in approve_users:
             continue
         parsed = parse_approval_command(msg.get("content") or "")
         if not parsed:
@@ -358,8 +739,10 @@ def check_mode(repo_root: str, state_path: str, bot_token: str, channel_id: str,
         cmd, arg = parsed
         arg = (arg or "").strip().lower()
 
-        target_days = list(pending_days)
-        if not arg:
+        target_days = pending_days
+        if arg in pending_meta:
+            target_days = [arg]
+        elif not arg:
             if len(pending_days) == 1:
                 target_days = [pending_days[0]]
             else:
@@ -370,7 +753,7 @@ def check_mode(repo_root: str, state_path: str, bot_token: str, channel_id: str,
             if entry.get("status") != "pending":
                 continue
             content_id = str(entry.get("content_id") or "")
-            if arg and arg not in {day.lower(), content_id.lower()}:
+            if arg and arg != day and arg != pending_meta[day]:
                 continue
 
             request_ts = parse_utc_timestamp(str(entry.get("requested_utc") or ""))
@@ -385,106 +768,29 @@ def check_mode(repo_root: str, state_path: str, bot_token: str, channel_id: str,
                 approvals[day] = entry
                 changed = True
                 print(f"[discord_publish_gate] rejected day={day} by={uid}")
-                if webhook_url:
-                    try:
-                        webhook_post_json(
-                            webhook_url,
-                            {
-                                "username": "Bizzal Publish Gate",
-                                "content": f"🛑 Rejected `{day}` (`{content_id}`) by <@{uid}>.",
-                            },
-                            wait=False,
-                        )
-                    except Exception:
-                        pass
+                notices.append(notice(day, f"🛑 Rejected `{day}` (`{content_id}`) by <@{uid}>."))
                 continue
 
             entry["status"] = "approved"
             entry["decision_utc"] = now_utc()
             entry["decision_by"] = uid
-
-            if webhook_url:
-                try:
-                    webhook_post_json(
-                        webhook_url,
-                        {
-                            "username": "Bizzal Publish Gate",
-                            "content": f"✅ Approval accepted for `{day}` (`{content_id}`) by <@{uid}>.",
-                        },
-                        wait=False,
-                    )
-                except Exception:
-                    pass
+            notices.append(notice(day, f"✅ Approval accepted for `{day}` (`{content_id}`) by <@{uid}>."))
 
             if publish:
-                if webhook_url:
-                    try:
-                        webhook_post_json(
-                            webhook_url,
-                            {
-                                "username": "Bizzal Publish Gate",
-                                "content": f"🚀 Publish started for `{day}` (`{content_id}`).",
-                            },
-                            wait=False,
-                        )
-                    except Exception:
-                        pass
-
-                rc, output = run_publish_command(repo_root, day)
-                entry["publish_rc"] = rc
-                entry["publish_output"] = short(output, 800)
-                if rc == 0:
-                    entry["status"] = "published"
-                    print(f"[discord_publish_gate] approved+pushed day={day} by={uid}")
-                    if webhook_url:
-                        try:
-                            webhook_post_json(
-                                webhook_url,
-                                {
-                                    "username": "Bizzal Publish Gate",
-                                    "content": f"🎉 Publish complete for `{day}` (`{content_id}`).",
-                                },
-                                wait=False,
-                            )
-                        except Exception:
-                            pass
-                else:
-                    entry["status"] = "approved_publish_failed"
-                    print(f"[discord_publish_gate] approved but publish failed day={day} rc={rc}")
-                    if webhook_url:
-                        try:
-                            webhook_post_json(
-                                webhook_url,
-                                {
-                                    "username": "Bizzal Publish Gate",
-                                    "content": f"❌ Publish failed for `{day}` (`{content_id}`), rc={rc}. Check logs.",
-                                },
-                                wait=False,
-                            )
-                        except Exception:
-                            pass
+                # "started" goes out with this cycle's notices, before check_mode runs the upload.
+                entry["status"] = "publishing"
+                entry["publishing_started_at"] = now_utc()
+                to_publish.append((day, content_id))
+                notices.append(notice(day, f"🚀 Publish started for `{day}` (`{content_id}`)."))
             else:
                 print(f"[discord_publish_gate] approved day={day} by={uid}")
-                if webhook_url:
-                    try:
-                        webhook_post_json(
-                            webhook_url,
-                            {
-                                "username": "Bizzal Publish Gate",
-                                "content": f"ℹ️ `{day}` approved and queued; publish runner not executed in this check.",
-                            },
-                            wait=False,
-                        )
-                    except Exception:
-                        pass
+                notices.append(notice(day, f"ℹ️ `{day}` approved and queued; publish runner not executed in this check."))
 
             approvals[day] = entry
             changed = True
 
-    if changed:
-        state["approvals"] = approvals
-        save_json(state_path, state)
-    return 0
+    _finish_cycle(state_path, state, approvals, webhook_url, notices, changed or cursor_moved)
+    return 0, to_publish
 
 
 def main() -> int:
@@ -514,7 +820,7 @@ def main() -> int:
     bot_token = (os.getenv("BIZZAL_DISCORD_BOT_TOKEN") or "").strip()
     channel_id = normalize_discord_id((os.getenv("BIZZAL_DISCORD_CHANNEL_ID") or "").strip())
     approved = (os.getenv("BIZZAL_DISCORD_APPROVER_USER_IDS") or "").strip()
-    approve_users = {normalize_discord_id(x.strip()) for x in approved.split(",") if normalize_discord_id(x.strip())}
+    approve_users = frozenset(uid for uid in (normalize_discord_id(x) for x in approved.split(",")) if uid)
     return check_mode(repo_root, state_file, bot_token, channel_id, approve_users, webhook_url, args.publish)
 
 
@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import itertools
 import json
 import os
 import random
@@ -11,7 +12,15 @@ except ImportError:
     print("ERROR: Missing PyYAML. Install with: python3 -m pip install --user pyyaml", file=sys.stderr)
     sys.exit(2)
 
-from reference_paths import resolve_active_srd_path
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from build_srd_index import load_pks
+from creature_filters import moral_choice_pks
+from reference_paths import load_yaml_file, resolve_active_srd_path
+from safe_io import safe_write_json
 
 REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
 ATOM_DIR = os.path.join(REPO_ROOT, "data", "atoms", "incoming")
@@ -19,34 +28,20 @@ REF_CFG = os.path.join(REPO_ROOT, "config", "reference_sources.yaml")
 VALIDATED_DIR = os.path.join(REPO_ROOT, "data", "atoms", "validated")
 
 def load_json(path: str):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    with open(path, "rb") as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
 
 def load_yaml(path: str):
-    with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    return load_yaml_file(path)
 
 def atomic_write_json(path: str, obj: dict):
-    tmp = path + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(obj, f, indent=2, ensure_ascii=False)
-        f.write("\n")
-    os.replace(tmp, path)
+    safe_write_json(path, obj)
 
 def today_atom_path():
     day = (os.getenv("BIZZAL_DAY") or "").strip() or datetime.now().strftime("%Y-%m-%d")
     return os.path.join(ATOM_DIR, f"{day}.json")
 
-def fixture_pks(records):
-    # Django fixture record: {"model": "...", "pk": 123, "fields": {...}}
-    out = []
-    if not isinstance(records, list):
-        return out
-    for rec in records:
-        if isinstance(rec, dict) and rec.get("pk") is not None:
-            out.append(rec["pk"])
-    return out
-
 
 def validated_atom_paths() -> list[str]:
     if not os.path.isdir(VALIDATED_DIR):
@@ -94,17 +89,24 @@ def recent_used_pks(pick_key: str, current_day: str, lookback_days: int) -> set:
 def choose_pk_with_variety(candidates: list, avoid: set):
     if not candidates:
         return None
-    filtered = [pk for pk in candidates if pk not in avoid]
-    pool = filtered if filtered else candidates
-    return random.choice(pool)
+    # Nothing to avoid: sample the sidecar pk list directly (same draw as the filtered path).
+    if not avoid:
+        return random.choice(candidates)
+    # Count, then index into a second pass: no filtered copy of the pk list. randrange(n)
+    # draws exactly like choice() on an n-item list.
+    n = sum(1 for pk in candidates if pk not in avoid)
+    if not n:
+        return random.choice(candidates)
+    idx = random.randrange(n)
+    return next(itertools.islice((pk for pk in candidates if pk not in avoid), idx, None))
 
 def pick_pk(active_dir: str, filename: str, avoid: set | None = None) -> int:
     path = os.path.join(active_dir, filename)
     if not os.path.exists(path):
         print(f"ERROR: Missing source file: {path}", file=sys.stderr)
         sys.exit(10)
-    records = load_json(path)
-    pks = fixture_pks(records)
+    # pk list comes from the build_srd_index sidecar; no fixture parse on warm runs
+    pks = load_pks(path)
     if not pks:
         print(f"ERROR: No pk records found in: {path}", file=sys.stderr)
         sys.exit(11)
@@ -114,73 +116,20 @@ def pick_pk(active_dir: str, filename: str, avoid: set | None = None) -> int:
         sys.exit(12)
     return pick
 
-def parse_cr(value) -> float:
-    if value is None:
-        return 0.0
-    s = str(value).strip().lower()
-    if not s:
-        return 0.0
-    try:
-        if "/" in s:
-            a, b = s.split("/", 1)
-            return float(a) / float(b)
-        return float(s)
-    except Exception:
-        return 0.0
-
-def creature_is_weak_moral_choice_candidate(rec: dict) -> bool:
-    fields = (rec or {}).get("fields") or {}
-    name = str(fields.get("name") or "").strip().lower()
-    ctype = str(fields.get("type") or fields.get("creature_type") or "").strip().lower()
-    cr = parse_cr(fields.get("challenge_rating") or fields.get("cr"))
-
-    if not name:
-        return False
-
-    mundane_mount_tokens = (
-        "riding horse", "draft horse", "pony", "mule", "donkey", "camel", "ox", "goat", "mastiff"
-    )
-    high_fantasy_exceptions = ("nightmare", "pegasus", "unicorn")
-
-    if any(tok in name for tok in mundane_mount_tokens) and not any(tok in name for tok in high_fantasy_exceptions):
-        return True
-
-    if ctype in ("beast", "animal") and cr <= 0.25:
-        return True
-
-    if cr == 0.0:
-        return True
-
-    return False
-
 def pick_creature_pk(active_dir: str, filename: str, category: str, angle: str, avoid: set | None = None) -> int:
     path = os.path.join(active_dir, filename)
     if not os.path.exists(path):
         print(f"ERROR: Missing source file: {path}", file=sys.stderr)
         sys.exit(10)
 
-    records = load_json(path)
-    if not isinstance(records, list):
-        print(f"ERROR: Creature source is not a list: {path}", file=sys.stderr)
-        sys.exit(11)
-
-    all_pks = []
-    filtered_pks = []
+    # pk lists come from build_srd_index sidecars; the fixture is only streamed when one is stale
+    filtered_pks = None
     cat = (category or "").strip().lower()
     ang = (angle or "").strip().lower()
-
-    for rec in records:
-        if not isinstance(rec, dict) or rec.get("pk") is None:
-            continue
-        pk = rec["pk"]
-        all_pks.append(pk)
-
-        if cat == "encounter_seed" and ang == "moral_choice" and creature_is_weak_moral_choice_candidate(rec):
-            continue
-        filtered_pks.append(pk)
-
+    if cat == "encounter_seed" and ang == "moral_choice":
+        filtered_pks = moral_choice_pks(path)
     if not filtered_pks:
-        filtered_pks = all_pks
+        filtered_pks = load_pks(path)
 
     if not filtered_pks:
         print(f"ERROR: No creature pk records found in: {path}", file=sys.stderr)
@@ -201,24 +150,32 @@ def ensure_pick(picks: dict, key: str, value):
         if picks.get(key) is None:
             picks[key] = value
 
-def canonical_category(category: str) -> str:
-    aliases = {
-        "gm_tip": "rules_ruling",
-        "roleplaying_tip": "character_micro_tip",
-        "character_class_spotlight": "character_micro_tip",
-        "class_spotlight": "character_micro_tip",
-        "dungeoneering_encounter": "encounter_seed",
-        "overworld_encounter": "encounter_seed",
-    }
-    return aliases.get((category or "").strip().lower(), (category or "").strip().lower())
+_ALIASES = {
+    "gm_tip": "rules_ruling",
+    "roleplaying_tip": "character_micro_tip",
+    "character_class_spotlight": "character_micro_tip",
+    "class_spotlight": "character_micro_tip",
+    "dungeoneering_encounter": "encounter_seed",
+    "overworld_encounter": "encounter_seed",
+}
+
+# Required pick per category (v1): category -> (pick key, sources key, default file)
+_DISPATCH = {
+    "monster_tactic": ("creature_pk", "creatures", "Creature.json"),
+    "spell_use_case": ("spell_pk", "spells", "Spell.json"),
+    "item_spotlight": ("item_pk", "items", "Item.json"),
+    "rules_ruling": ("rule_pk", "rules", "Rule.json"),
+    "rules_myth": ("rule_pk", "rules", "Rule.json"),
+    # anchor on a creature; later we can add optional rule_pk, environment, etc.
+    "encounter_seed": ("creature_pk", "creatures", "Creature.json"),
+    "character_micro_tip": ("class_pk", "classes", "CharacterClass.json"),
+}
 
-def main():
-    atom_path = today_atom_path()
-    if not os.path.exists(atom_path):
-        print(f"ERROR: Atom not found: {atom_path}", file=sys.stderr)
-        sys.exit(3)
+def canonical_category(category: str) -> str:
+    c = (category or "").strip().lower()
+    return _ALIASES.get(c, c)
 
-    atom = load_json(atom_path)
+def run(atom: dict) -> dict:
     day = (atom.get("day") or (os.getenv("BIZZAL_DAY") or "").strip() or datetime.now().strftime("%Y-%m-%d"))
     category = canonical_category(atom.get("category"))
     angle = (atom.get("angle") or "").strip().lower()
@@ -242,52 +199,37 @@ def main():
 
     sources = cfg.get("sources", {})
 
-    # Resolve filenames from config
-    creature_file = (sources.get("creatures") or {}).get("file", "Creature.json")
-    spell_file    = (sources.get("spells") or {}).get("file", "Spell.json")
-    item_file     = (sources.get("items") or {}).get("file", "Item.json")
-    rule_file     = (sources.get("rules") or {}).get("file", "Rule.json")
-    class_file    = (sources.get("classes") or {}).get("file", "CharacterClass.json")
+    if category not in _DISPATCH:
+        print(f"ERROR: Unknown category '{category}'", file=sys.stderr)
+        sys.exit(6)
+    pick_key, sources_key, default_file = _DISPATCH[category]
+
+    # Resolve filename from config
+    fname = (sources.get(sources_key) or {}).get("file", default_file)
 
     atom.setdefault("picks", {})
     picks = atom["picks"]
 
-    avoid_creature = recent_used_pks("creature_pk", day, lookback_days)
-    avoid_spell = recent_used_pks("spell_pk", day, lookback_days)
-    avoid_item = recent_used_pks("item_pk", day, lookback_days)
-    avoid_rule = recent_used_pks("rule_pk", day, lookback_days)
-    avoid_class = recent_used_pks("class_pk", day, lookback_days)
-
-    # Fill required picks per category (v1)
-    if category == "monster_tactic":
-        ensure_pick(picks, "creature_pk", pick_creature_pk(active_dir, creature_file, category, angle, avoid_creature))
-
-    elif category == "spell_use_case":
-        ensure_pick(picks, "spell_pk", pick_pk(active_dir, spell_file, avoid_spell))
-
-    elif category == "item_spotlight":
-        ensure_pick(picks, "item_pk", pick_pk(active_dir, item_file, avoid_item))
-
-    elif category in ("rules_ruling", "rules_myth"):
-        ensure_pick(picks, "rule_pk", pick_pk(active_dir, rule_file, avoid_rule))
-
-    elif category == "encounter_seed":
-        # anchor on a creature; later we can add optional rule_pk, environment, etc.
-        ensure_pick(picks, "creature_pk", pick_creature_pk(active_dir, creature_file, category, angle, avoid_creature))
-
-    elif category == "character_micro_tip":
-        ensure_pick(picks, "class_pk", pick_pk(active_dir, class_file, avoid_class))
+    avoid = recent_used_pks(pick_key, day, lookback_days)
 
+    if pick_key == "creature_pk":
+        ensure_pick(picks, pick_key, pick_creature_pk(active_dir, fname, category, angle, avoid))
     else:
-        print(f"ERROR: Unknown category '{category}'", file=sys.stderr)
-        sys.exit(6)
+        ensure_pick(picks, pick_key, pick_pk(active_dir, fname, avoid))
 
     # Stamp provenance
     atom.setdefault("source", {})
     atom["source"]["active_srd_path"] = active_dir
     atom["source"]["filled_picks_utc"] = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return atom
+
+def main():
+    atom_path = today_atom_path()
+    if not os.path.exists(atom_path):
+        print(f"ERROR: Atom not found: {atom_path}", file=sys.stderr)
+        sys.exit(3)
 
-    atomic_write_json(atom_path, atom)
+    atomic_write_json(atom_path, run(load_json(atom_path)))
     print(atom_path)
 
 if __name__ == "__main__":
@@ -1,9 +1,25 @@
 #!/usr/bin/env python3
+import argparse
 import json
 import os
 import hashlib
+import mmap
 from datetime import datetime, timezone
 from collections import Counter, defaultdict
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+    if ijson.backend == "python":
+        ijson = None  # pure-Python backend is slower than the full orjson/json parse it replaces
+except ImportError:
+    ijson = None
 
 REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
 OUT_DIR = os.path.join(REPO_ROOT, "data", "reference_inventory")
@@ -11,18 +27,80 @@ REF_CFG = os.path.join(REPO_ROOT, "config", "reference_sources.yaml")
 
 from reference_paths import resolve_active_srd_path
 
-def sha256_file(path: str) -> str:
-    h = hashlib.sha256()
-    with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
+def is_json_array(f) -> bool:
+    head = f.read(64).lstrip()
+    f.seek(0)
+    return head[:1] == b"["
+
+def scan_file(path: str):
+    # One pass over the file's pages: hash the mapping, then stream records from the same mapping.
+    model_counter = Counter()
+    field_keys_counter = Counter()
+    rec_count = None
+    sample = None
+
+    def count_slow(rec):
+        if isinstance(rec, dict):
+            m = rec.get("model")
+            if m: model_counter[m] += 1
+            fields = rec.get("fields")
+            if isinstance(fields, dict):
+                field_keys_counter.update(fields.keys())
+
+    def count(records):
+        nonlocal rec_count, sample
+        rec_count = 0
+        # Fixture records are homogeneous {model, pk, fields}: index them directly and
+        # only fall back to the defensive checks for the odd record that isn't.
+        get = itemgetter("model", "fields")
+        add_keys = field_keys_counter.update
+        for rec in records:
+            if rec_count == 0:
+                sample = rec
+            rec_count += 1
+            try:
+                m, fields = get(rec)
+                keys = fields.keys()
+            except (KeyError, TypeError, AttributeError):
+                count_slow(rec)
+                continue
+            if m: model_counter[m] += 1
+            add_keys(keys)
 
-def load_json(path: str):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return size, hashlib.sha256().hexdigest(), rec_count, model_counter, field_keys_counter, sample
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            sha = hashlib.sha256(mm).hexdigest()
+            if ijson is None:
+                data = orjson.loads(memoryview(mm)) if orjson is not None else json.loads(mm[:])
+                # Django fixtures are usually a list of records: {model, pk, fields}
+                if isinstance(data, list):
+                    count(data)
+            elif is_json_array(mm):
+                count(ijson.items(mm, "item", use_float=True))
+
+    return size, sha, rec_count, model_counter, field_keys_counter, sample
+
+def load_previous_files(inv_path: str, active_real: str) -> dict:
+    # Previous run's per-file entries, only if they describe the same SRD directory.
+    try:
+        with open(inv_path, "rb") as f:
+            raw = f.read()
+        prev = orjson.loads(raw) if orjson is not None else json.loads(raw.decode("utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(prev, dict) or prev.get("active_srd_path") != active_real:
+        return {}
+    files = prev.get("files")
+    return files if isinstance(files, dict) else {}
 
 def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--full", action="store_true", help="Re-hash and re-scan every file, ignoring the previous inventory")
+    args = ap.parse_args()
+
     os.makedirs(OUT_DIR, exist_ok=True)
 
     active_srd, _cfg = resolve_active_srd_path(REPO_ROOT, REF_CFG)
@@ -37,80 +115,72 @@ def main():
         "files": {}
     }
 
-    md_lines = []
-    md_lines.append(f"# ACTIVE_WOTC_SRD Inventory")
-    md_lines.append(f"- Generated (UTC): {inventory['generated_utc']}")
-    md_lines.append(f"- Path: `{inventory['active_srd_path']}`")
-    md_lines.append(f"- JSON files: {inventory['file_count']}")
-    md_lines.append("")
-
-    # manifest sha256 lines
-    manifest_lines = []
-
-    for fname in files:
-        path = os.path.join(active_srd, fname)
-        st = os.stat(path)
-        size = st.st_size
-        sha = sha256_file(path)
-        manifest_lines.append(f"{sha}  {fname}")
-
-        data = load_json(path)
-
-        # Django fixtures are usually a list of records: {model, pk, fields}
-        rec_count = len(data) if isinstance(data, list) else None
-
-        model_counter = Counter()
-        field_keys_counter = Counter()
-
-        sample = None
-        if isinstance(data, list) and data:
-            sample = data[0]
-            for rec in data:
-                if isinstance(rec, dict):
-                    m = rec.get("model")
-                    if m: model_counter[m] += 1
-                    fields = rec.get("fields")
-                    if isinstance(fields, dict):
-                        field_keys_counter.update(fields.keys())
-
-        # top field keys (most common)
-        top_fields = field_keys_counter.most_common(25)
-
-        inventory["files"][fname] = {
-            "bytes": size,
-            "sha256": sha,
-            "record_count": rec_count,
-            "models": dict(model_counter),
-            "top_field_keys": top_fields,
-            "sample_record": sample
-        }
-
-        md_lines.append(f"## {fname}")
-        md_lines.append(f"- Size: {size:,} bytes")
-        md_lines.append(f"- SHA256: `{sha}`")
-        md_lines.append(f"- Records: {rec_count}")
-        if model_counter:
-            md_lines.append(f"- Models: {', '.join([f'{k} ({v})' for k,v in model_counter.most_common(5)])}")
-        if top_fields:
-            md_lines.append(f"- Top fields: {', '.join([k for k,_ in top_fields[:12]])}")
-        md_lines.append("")
-
-    # write outputs
     inv_path = os.path.join(OUT_DIR, "active_files.json")
     md_path  = os.path.join(OUT_DIR, "active_summary.md")
     man_path = os.path.join(OUT_DIR, "active_manifest.sha256")
 
-    with open(inv_path, "w", encoding="utf-8") as f:
-        json.dump(inventory, f, indent=2, ensure_ascii=False)
-        f.write("\n")
-
-    with open(md_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(md_lines))
-        f.write("\n")
-
-    with open(man_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(manifest_lines))
-        f.write("\n")
+    # Files whose size + mtime_ns match the previous run reuse its entry; only the rest are scanned.
+    prev_files = {} if args.full else load_previous_files(inv_path, inventory["active_srd_path"])
+    paths = [os.path.join(active_srd, fname) for fname in files]
+    stats = [os.stat(path) for path in paths]
+    reuse = {}
+    for fname, st in zip(files, stats):
+        prev = prev_files.get(fname)
+        if isinstance(prev, dict) and prev.get("mtime_ns") == st.st_mtime_ns and prev.get("bytes") == st.st_size:
+            reuse[fname] = prev
+    stale = [path for fname, path in zip(files, paths) if fname not in reuse]
+
+    # Summary + manifest are written as each file's scan result arrives (no line lists).
+    with open(md_path, "w", encoding="utf-8") as md, open(man_path, "w", encoding="utf-8") as man:
+        md.write(
+            f"# ACTIVE_WOTC_SRD Inventory\n"
+            f"- Generated (UTC): {inventory['generated_utc']}\n"
+            f"- Path: `{inventory['active_srd_path']}`\n"
+            f"- JSON files: {inventory['file_count']}\n"
+            f"\n"
+        )
+        if not files:
+            man.write("\n")
+
+        # Files are independent: hash + scan them across cores; map() keeps sorted order.
+        with ProcessPoolExecutor(max_workers=max(1, min(len(stale), os.cpu_count() or 1))) as ex:
+            scanned = ex.map(scan_file, stale)
+            for fname, st in zip(files, stats):
+                prev = reuse.get(fname)
+                if prev is not None:
+                    size, sha, rec_count, sample = prev["bytes"], prev["sha256"], prev.get("record_count"), prev.get("sample_record")
+                    model_counter = Counter(prev.get("models") or {})
+                    top_fields = [tuple(kv) for kv in prev.get("top_field_keys") or []]
+                else:
+                    size, sha, rec_count, model_counter, field_keys_counter, sample = next(scanned)
+                    # top field keys (most common)
+                    top_fields = field_keys_counter.most_common(25)
+
+                man.write(f"{sha}  {fname}\n")
+
+                inventory["files"][fname] = {
+                    "bytes": size,
+                    "mtime_ns": st.st_mtime_ns,
+                    "sha256": sha,
+                    "record_count": rec_count,
+                    "models": dict(model_counter),
+                    "top_field_keys": top_fields,
+                    "sample_record": sample
+                }
+
+                md.write(f"## {fname}\n- Size: {size:,} bytes\n- SHA256: `{sha}`\n- Records: {rec_count}\n")
+                if model_counter:
+                    md.write(f"- Models: {', '.join([f'{k} ({v})' for k,v in model_counter.most_common(5)])}\n")
+                if top_fields:
+                    md.write(f"- Top fields: {', '.join([k for k,_ in top_fields[:12]])}\n")
+                md.write("\n")
+
+    if orjson is not None:
+        with open(inv_path, "wb") as f:
+            f.write(orjson.dumps(inventory, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+    else:
+        with open(inv_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(inventory, indent=2, ensure_ascii=False) + "\n")
 
     print(inv_path)
     print(md_path)
@@ -10,35 +10,38 @@ except ImportError:
     print("ERROR: Missing PyYAML. Install with: python3 -m pip install --user pyyaml", file=sys.stderr)
     sys.exit(2)
 
-from reference_paths import resolve_active_srd_path
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from build_srd_index import read_record
+from reference_paths import load_yaml_file, resolve_active_srd_path
 
 REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
-ATOM_PATH = os.path.join(REPO_ROOT, "data", "atoms", "incoming", datetime.now().strftime("%Y-%m-%d") + ".json")
 REF_CFG = os.path.join(REPO_ROOT, "config", "reference_sources.yaml")
 
+def resolve_day() -> str:
+    return (os.getenv("BIZZAL_DAY") or "").strip() or datetime.now().strftime("%Y-%m-%d")
+
+def atom_path(day: str) -> str:
+    return os.path.join(REPO_ROOT, "data", "atoms", "incoming", day + ".json")
+
 def load_json(path: str):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    with open(path, "rb") as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
 
 def load_yaml(path: str):
-    with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
-
-def index_by_pk(records):
-    idx = {}
-    if not isinstance(records, list):
-        return idx
-    for rec in records:
-        if isinstance(rec, dict) and rec.get("pk") is not None:
-            idx[rec["pk"]] = rec
-    return idx
+    return load_yaml_file(path)
 
 def main():
-    if not os.path.exists(ATOM_PATH):
-        print(f"ERROR: Atom not found: {ATOM_PATH}", file=sys.stderr)
+    atom_file = atom_path(resolve_day())
+    if not os.path.exists(atom_file):
+        print(f"ERROR: Atom not found: {atom_file}", file=sys.stderr)
         sys.exit(3)
 
-    atom = load_json(ATOM_PATH)
+    atom = load_json(atom_file)
     category = atom.get("category")
     picks = atom.get("picks") or {}
 
@@ -86,9 +89,7 @@ def main():
         print(f"ERROR: Missing source file: {path}", file=sys.stderr)
         sys.exit(6)
 
-    records = load_json(path)
-    idx = index_by_pk(records)
-    rec = idx.get(pk)
+    rec = read_record(path, pk)
     if not rec:
         print(f"ERROR: pk not found in {filename}: {pk}", file=sys.stderr)
         sys.exit(7)
@@ -104,7 +105,10 @@ def main():
         "raw_fields": fields
     }
 
-    print(json.dumps(fact, indent=2, ensure_ascii=False))
+    if orjson is not None:
+        print(orjson.dumps(fact, option=orjson.OPT_INDENT_2).decode("utf-8"))
+    else:
+        print(json.dumps(fact, indent=2, ensure_ascii=False))
 
 if __name__ == "__main__":
     main()
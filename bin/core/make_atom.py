@@ -1,14 +1,15 @@
 #!/usr/bin/env python3
-import argparse
-import json, os, sys, subprocess, hashlib, random
-from datetime import datetime, UTC
+import bisect, contextlib, functools, importlib, itertools, json, stat, os, sys, subprocess, hashlib, random, traceback
+from datetime import date, datetime, UTC
 
 try:
-    import yaml
+    import orjson
 except ImportError:
-    yaml = None
+    orjson = None
 
-from reference_paths import resolve_active_srd_path, resolve_srd_pdf_path
+from reference_paths import resolve_srd_paths
+from safe_io import dump_json_bytes, replace_write_bytes
+from script_ids import script_id_for
 
 REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
 
@@ -19,12 +20,13 @@ VALID_DIR    = os.path.join(DATA_DIR, "atoms", "validated")
 FAILED_DIR   = os.path.join(DATA_DIR, "atoms", "failed")
 
 TOPIC_SPINE  = os.path.join(CONFIG_DIR, "topic_spine.yaml")
+TOPIC_SPINE_JSON = os.path.join(CONFIG_DIR, "topic_spine.json")  # compiled copy (compile_topic_spine.py)
 SCHEMA_MIN   = os.path.join(CONFIG_DIR, "atom_schema_min.json")
 REF_CFG      = os.path.join(CONFIG_DIR, "reference_sources.yaml")
 
 DOW_KEYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
 
-def resolve_day(explicit_day: str | None = None) -> str:
+def resolve_day(explicit_day: str | None = None, now: datetime | None = None) -> str:
     day = (explicit_day or os.getenv("BIZZAL_DAY") or "").strip()
     if day:
         try:
@@ -32,7 +34,7 @@ def resolve_day(explicit_day: str | None = None) -> str:
             return day
         except ValueError:
             die(f"[make_atom] invalid day format: {day} (expected YYYY-MM-DD)")
-    return datetime.now().strftime("%Y-%m-%d")
+    return (now.astimezone() if now is not None else datetime.now()).strftime("%Y-%m-%d")
 
 
 def atom_path_for_day(day: str) -> str:
@@ -43,15 +45,12 @@ def die(msg: str, code: int = 1):
     raise SystemExit(code)
 
 def atomic_write_json(path, obj):
-    tmp = path + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(obj, f, indent=2, ensure_ascii=False)
-        f.write("\n")
-    os.replace(tmp, path)
+    replace_write_bytes(path, dump_json_bytes(obj))
 
 def load_json(path):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    with open(path, "rb") as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
 
 
 def validated_atom_paths() -> list[str]:
@@ -83,72 +82,224 @@ def recent_values(key: str, lookback_days: int) -> list[str]:
     return vals
 
 
+# Prefix sums per weight vector; the same category/angle pools recur across days and atoms.
+@functools.lru_cache(maxsize=64)
+def cum_weights(weights: tuple) -> tuple:
+    return tuple(itertools.accumulate(weights))
+
+
+def roll_weighted(items: list, seed_key: str):
+    # Binary search over prefix sums; randrange(total) + 1 is the same draw as randint(1, total).
+    cum = cum_weights(tuple(w for _, w in items))
+    rng = random.Random(seed32(seed_key))
+    return items[bisect.bisect_left(cum, rng.randrange(cum[-1]) + 1)][0]
+
+
 def choose_varied_weighted(weights: dict, seed_key: str, recent: list[str]) -> str | None:
-    items = [(str(k), int(v)) for k, v in (weights or {}).items() if int(v) > 0]
+    weights = weights or {}
+    # int() once per weight (was twice: filter + tuple).
+    items = [(str(k), w) for k, w in zip(weights, map(int, weights.values())) if w > 0]
     if not items:
         return None
 
-    recent_set = set(recent)
-    filtered = [(k, w) for k, w in items if str(k).lower() not in recent_set]
-    pool = filtered if filtered else items
+    pool = items
+    if recent:
+        recent_set = set(recent)
+        pool = [(k, w) for k, w in items if k.lower() not in recent_set] or items
 
-    total = sum(v for _, v in pool)
-    rng = random.Random(int(sha256_text(seed_key)[:8], 16))
-    roll = rng.randint(1, total)
-    acc = 0
-    for k, w in pool:
-        acc += w
-        if roll <= acc:
-            return k
-    return pool[0][0]
+    return roll_weighted(pool, seed_key)
 
-def sha256_text(s: str) -> str:
-    return hashlib.sha256(s.encode("utf-8")).hexdigest()
+# Same value as int(sha256(key).hexdigest()[:8], 16) (first 4 digest bytes), without the hex round trip.
+def seed32(key: str) -> int:
+    return int.from_bytes(hashlib.sha256(key.encode("utf-8")).digest()[:4], "big")
 
 def run(cmd, check=True):
     # cmd can be list or string
     if isinstance(cmd, str):
         cmd = cmd.split()
-    env = os.environ.copy()
-    r = subprocess.run(cmd, cwd=REPO_ROOT, env=env)
+    # Children inherit os.environ (incl. BIZZAL_DAY set in main); no per-call copy needed.
+    r = subprocess.run(cmd, cwd=REPO_ROOT)
     if check and r.returncode != 0:
         die(f"[make_atom] command failed ({r.returncode}): {' '.join(cmd)}")
     return r.returncode
 
+def in_process_name(path_rel: str) -> str | None:
+    # Python steps in bin/core run in-process (import + main()/run()) instead of paying an
+    # interpreter start per step; anything else still goes through run().
+    name, ext = os.path.splitext(os.path.basename(path_rel))
+    step_dir = os.path.dirname(os.path.join(REPO_ROOT, path_rel))
+    if ext != ".py" or os.path.realpath(step_dir) != os.path.realpath(os.path.dirname(__file__)):
+        return None
+    return name
+
+def call_step(fn):
+    # SystemExit/exceptions from a step become a return code, as if it ran as a subprocess.
+    rc, result = 0, None
+    try:
+        with contextlib.chdir(REPO_ROOT):
+            result = fn()
+    except SystemExit as exc:
+        if exc.code is None or isinstance(exc.code, int):
+            rc = exc.code or 0
+        else:
+            print(exc.code, file=sys.stderr)
+            rc = 1
+    except Exception:
+        traceback.print_exc()
+        rc = 1
+    sys.stdout.flush()
+    return rc, result
+
+def run_atom_step(path_rel: str, atom: dict, atom_path: str) -> dict:
+    # Steps exposing run(atom) -> atom get the dict directly: no write/re-read of the
+    # incoming atom between steps. Others see it on disk as before.
+    name = in_process_name(path_rel)
+
+    def via_file(step):
+        atomic_write_json(atom_path, atom)
+        step()
+        return load_json(atom_path)
+
+    def step():
+        mod = importlib.import_module(name)
+        if hasattr(mod, "run"):
+            return mod.run(atom)
+        return via_file(mod.main)
+
+    if name is None:
+        return via_file(lambda: run([os.path.join(REPO_ROOT, path_rel)]))
+    rc, result = call_step(step)
+    if rc != 0:
+        # leave the atom as of the failing step in incoming/ for inspection
+        atomic_write_json(atom_path, atom)
+        die(f"[make_atom] step failed ({rc}): {path_rel}")
+    return result
+
+# One stat per step path per run; the answer doesn't change mid-pipeline.
+@functools.lru_cache(maxsize=None)
 def has_exec(path_rel: str) -> bool:
-    p = os.path.join(REPO_ROOT, path_rel)
-    return os.path.exists(p) and os.access(p, os.X_OK)
+    try:
+        st = os.stat(os.path.join(REPO_ROOT, path_rel))
+    except OSError:
+        return False
+    return stat.S_ISREG(st.st_mode) and bool(st.st_mode & 0o111)
+
+# (active SRD dir, SRD pdf) for this process, re-resolved when reference_sources.yaml or
+# the env overrides change.
+_SRD_CACHE: tuple[tuple, tuple[str, str]] | None = None
+_SRD_ENV_KEYS = ("BIZZAL_ACTIVE_SRD_PATH", "BG_ACTIVE_SRD_PATH", "BIZZAL_SRD_PDF_PATH", "BG_SRD_PDF_PATH")
+
+def srd_paths() -> tuple[str, str]:
+    global _SRD_CACHE
+    try:
+        st = os.stat(REF_CFG)
+        sig = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        sig = None
+    key = (sig, tuple(os.getenv(k) for k in _SRD_ENV_KEYS))
+    if _SRD_CACHE is not None and _SRD_CACHE[0] == key:
+        return _SRD_CACHE[1]
+    active_srd_path, srd_pdf_path, _ = resolve_srd_paths(REPO_ROOT, REF_CFG)
+    _SRD_CACHE = (key, (active_srd_path, srd_pdf_path))
+    return _SRD_CACHE[1]
+
+# Dirs already created/confirmed by this process; later calls skip the makedirs syscalls.
+_ENSURED: set[str] = set()
+
+def ensure_dir(d: str):
+    if d not in _ENSURED:
+        os.makedirs(d, exist_ok=True)
+        _ENSURED.add(d)
 
 def ensure_dirs():
     for d in [INCOMING_DIR, VALID_DIR, FAILED_DIR]:
-        os.makedirs(d, exist_ok=True)
+        ensure_dir(d)
 
 # ---------- topic spine parsing ----------
 
+# PyYAML is imported on first need only: a fresh compiled topic_spine.json never needs it.
+_YAML_MOD = None
+_WARNED_PY_LOADER = False
+
+def yaml_module():
+    global _YAML_MOD
+    if _YAML_MOD is None:
+        try:
+            import yaml
+        except ImportError:
+            yaml = False
+        _YAML_MOD = yaml
+    return _YAML_MOD or None
+
+def yaml_loader():
+    # LibYAML's C loader is ~10x faster; fall back to the pure-Python one (warned once).
+    global _WARNED_PY_LOADER
+    yaml = yaml_module()
+    loader = getattr(yaml, "CSafeLoader", None)
+    if loader is not None:
+        return loader
+    if not _WARNED_PY_LOADER:
+        _WARNED_PY_LOADER = True
+        print("[make_atom] WARNING: PyYAML built without LibYAML; using the slower pure-Python SafeLoader", file=sys.stderr)
+    return yaml.SafeLoader
+
+def parse_topic_spine_yaml() -> dict:
+    yaml = yaml_module()
+    with open(TOPIC_SPINE, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=yaml_loader()) or {}
+
+def write_topic_spine_json(spine: dict) -> bool:
+    # Only if JSON round-trips it exactly (no int keys / dates silently changing type).
+    try:
+        text = json.dumps(spine, ensure_ascii=False)
+        if json.loads(text) != spine:
+            return False
+        replace_write_bytes(TOPIC_SPINE_JSON, (text + "\n").encode("utf-8"))
+        return True
+    except (TypeError, ValueError, OSError):
+        return False
+
+# Parsed spine keyed by the YAML's (mtime_ns, size); re-parsed only when the file changes.
+# The compiled JSON sibling is preferred while it is at least as new as the YAML.
+_SPINE_CACHE: tuple[tuple[int, int], dict] | None = None
+
 def load_topic_spine():
-    if not os.path.exists(TOPIC_SPINE) or yaml is None:
-        return {}
+    global _SPINE_CACHE
     try:
-        with open(TOPIC_SPINE, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f) or {}
-    except Exception:
+        st = os.stat(TOPIC_SPINE)
+    except OSError:
         return {}
+    key = (st.st_mtime_ns, st.st_size)
+    if _SPINE_CACHE is not None and _SPINE_CACHE[0] == key:
+        return _SPINE_CACHE[1]
 
-def weighted_choice(weights: dict, seed_key: str):
-    items = [(k, int(v)) for k, v in (weights or {}).items() if int(v) > 0]
-    if not items:
-        return None
-    total = sum(v for _, v in items)
-    rng = random.Random(int(sha256_text(seed_key)[:8], 16))
-    roll = rng.randint(1, total)
-    acc = 0
-    for k, w in items:
-        acc += w
-        if roll <= acc:
-            return k
-    return items[0][0]
-
-def pick_category_and_angle_for_day(day_str: str):
+    spine = None
+    try:
+        if os.stat(TOPIC_SPINE_JSON).st_mtime_ns >= st.st_mtime_ns:
+            spine = load_json(TOPIC_SPINE_JSON)
+    except (OSError, ValueError):
+        spine = None
+    if not isinstance(spine, dict):
+        if yaml_module() is None:
+            # Without PyYAML a stale compiled copy still beats an empty spine.
+            try:
+                spine = load_json(TOPIC_SPINE_JSON)
+            except (OSError, ValueError):
+                return {}
+            if not isinstance(spine, dict):
+                return {}
+        else:
+            try:
+                spine = parse_topic_spine_yaml()
+            except Exception:
+                return {}
+            if isinstance(spine, dict):
+                write_topic_spine_json(spine)
+
+    _SPINE_CACHE = (key, spine)
+    return spine
+
+def pick_category_and_angle_for_day(day_str: str, now: datetime | None = None):
     spine = load_topic_spine()
     try:
         category_lookback = int((os.getenv("BIZZAL_CATEGORY_VARIETY_LOOKBACK_DAYS") or "7").strip())
@@ -166,10 +317,11 @@ def pick_category_and_angle_for_day(day_str: str):
     cw = spine.get("category_weights") if isinstance(spine, dict) else {}
 
     if isinstance(wk, dict) and wk:
+        # day_str was validated by resolve_day; fromisoformat skips strptime's format parsing
         try:
-            dow = DOW_KEYS[datetime.strptime(day_str, "%Y-%m-%d").weekday()]
+            dow = DOW_KEYS[date.fromisoformat(day_str).weekday()]
         except ValueError:
-            dow = DOW_KEYS[datetime.now().weekday()]
+            dow = DOW_KEYS[(now.astimezone() if now is not None else datetime.now()).weekday()]
         category = wk.get(dow)
         if category:
             angle_weights = ((cw.get(category) or {}).get("angles") or {}) if isinstance(cw, dict) else {}
@@ -204,10 +356,13 @@ def pick_category_and_angle_for_day(day_str: str):
 
 # ---------- atom creation / validation ----------
 
-def new_atom(day_str: str):
+def utc_iso(now: datetime) -> str:
+    return now.isoformat(timespec="seconds").replace("+00:00","Z")
+
+def new_atom(day_str: str, now_iso: str | None = None):
     return {
                 "day": day_str,
-        "created_at": datetime.now(UTC).isoformat(timespec="seconds").replace("+00:00","Z"),
+        "created_at": now_iso or utc_iso(datetime.now(UTC)),
         "category": None,
         "angle": None,
         "style": {},
@@ -231,12 +386,14 @@ def clear_irrelevant_picks(atom: dict):
     # This function is mostly about wiping stale picks when you switch categories.
     atom["picks"] = picks
 
+_REQUIRED_TOP = frozenset({"day", "created_at", "category", "angle", "style", "picks", "fact", "script", "script_id", "content"})
+_CONTENT_REQUIRED = frozenset({"content_id", "episode_id", "month_id", "month_bundle_id", "canonical_hash", "script_id", "asset_contract", "segments", "tags"})
+
 def minimal_validate(atom: dict):
     # Minimal “shape” validation (keeps you from shipping junk)
-    required_top = ["day", "created_at", "category", "angle", "style", "picks", "fact", "script", "script_id", "content"]
-    for k in required_top:
-        if k not in atom:
-            return False, f"missing key: {k}"
+    missing = _REQUIRED_TOP - atom.keys()
+    if missing:
+        return False, f"missing keys: {sorted(missing)}"
 
     if not isinstance(atom["picks"], dict):
         return False, "picks not dict"
@@ -253,15 +410,12 @@ def minimal_validate(atom: dict):
 
     # script_id integrity check
     s = atom["script"]
-    packed = f"{s.get('hook','').strip()}\n{s.get('body','').strip()}\n{s.get('cta','').strip()}\n"
-    expect = sha256_text(packed)
-    if atom.get("script_id") != expect:
+    if atom.get("script_id") != script_id_for(s):
         return False, "script_id does not match script content"
 
-    content_required = ["content_id", "episode_id", "month_id", "month_bundle_id", "canonical_hash", "script_id", "asset_contract", "segments", "tags"]
-    for k in content_required:
-        if k not in atom["content"]:
-            return False, f"content missing key: {k}"
+    missing = _CONTENT_REQUIRED - atom["content"].keys()
+    if missing:
+        return False, f"content missing keys: {sorted(missing)}"
 
     if atom["content"].get("script_id") != atom.get("script_id"):
         return False, "content.script_id does not match script_id"
@@ -286,53 +440,61 @@ def load_schema_min_ok():
 
 # ---------- pipeline orchestration ----------
 
+# Category keyword -> legacy picker scripts, checked in order (substring match, first wins).
+# Map your categories to picker scripts here as you add them.
+_PICKER_MAP = (
+    ("spell", ("bin/core/pick_spell.py",)),
+    ("monster", ("bin/core/pick_creature.py",)),
+    ("creature", ("bin/core/pick_creature.py",)),
+    ("item", ("bin/core/pick_item.py",)),
+    ("gear", ("bin/core/pick_item.py",)),
+    ("rule", ("bin/core/pick_rule.py",)),
+    ("class", ("bin/core/pick_class.py",)),
+)
+# fallback: try item (safe / broad)
+_PICKER_FALLBACK = ("bin/core/pick_item.py",)
+
 def pickers_for_category(cat: str):
     c = (cat or "").lower()
-    # Map your categories to picker scripts (add more here as you add categories)
-    if "spell" in c:
-        return ["bin/core/pick_spell.py"]
-    if "monster" in c or "creature" in c:
-        return ["bin/core/pick_creature.py"]
-    if "item" in c or "gear" in c:
-        return ["bin/core/pick_item.py"]
-    if "rule" in c:
-        return ["bin/core/pick_rule.py"]
-    if "class" in c:
-        return ["bin/core/pick_class.py"]
-    # fallback: try item (safe / broad)
-    return ["bin/core/pick_item.py"]
-
-def safe_move(src, dst_dir):
-    os.makedirs(dst_dir, exist_ok=True)
-    base = os.path.basename(src)
-    dst = os.path.join(dst_dir, base)
-    os.replace(src, dst)
+    for token, pickers in _PICKER_MAP:
+        if token in c:
+            return list(pickers)
+    return list(_PICKER_FALLBACK)
+
+def route_atom(atom: dict, atom_path: str, dst_dir: str) -> str:
+    # Write the finished atom straight into validated/ or failed/ (no incoming write + move),
+    # then drop any staged incoming copy from a rerun or file-based step.
+    ensure_dir(dst_dir)
+    dst = os.path.join(dst_dir, os.path.basename(atom_path))
+    try:
+        atomic_write_json(dst, atom)
+    except FileNotFoundError:
+        # dst_dir was removed since we ensured it; recreate once and retry
+        _ENSURED.discard(dst_dir)
+        ensure_dir(dst_dir)
+        atomic_write_json(dst, atom)
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(atom_path)
     return dst
 
-def main():
-    ap = argparse.ArgumentParser(description="Create and validate daily atom")
-    ap.add_argument("--day", default="", help="Target day YYYY-MM-DD (default: BIZZAL_DAY or today)")
-    args = ap.parse_args()
-
-    day = resolve_day(args.day)
+def make_day_atom(day: str, now: datetime):
     atom_path = atom_path_for_day(day)
     os.environ["BIZZAL_DAY"] = day
 
     ensure_dirs()
 
-    # Create or load today's atom
+    # Create or load today's atom (a new one is first written once category/source are set)
     if os.path.exists(atom_path):
         atom = load_json(atom_path)
     else:
-        atom = new_atom(day)
-        atomic_write_json(atom_path, atom)
+        atom = new_atom(day, utc_iso(now))
 
     # Ensure baseline schema file exists (optional but recommended)
     if not load_schema_min_ok():
         print("[make_atom] WARNING: config/atom_schema_min.json not found; continuing with minimal validation", file=sys.stderr)
 
     # Category/angle come from topic spine weekly schedule + weighted angles.
-    picked_category, picked_angle = pick_category_and_angle_for_day(day)
+    picked_category, picked_angle = pick_category_and_angle_for_day(day, now)
     atom["category"] = picked_category or atom.get("category") or "monster_tactic"
     if picked_angle:
         atom["angle"] = picked_angle
@@ -346,46 +508,57 @@ def main():
     atom["script_id"] = None
     atom["content"] = {}
 
-    active_srd_path, _ = resolve_active_srd_path(REPO_ROOT, REF_CFG)
-    srd_pdf_path, _ = resolve_srd_pdf_path(REPO_ROOT, REF_CFG)
+    active_srd_path, srd_pdf_path = srd_paths()
     atom.setdefault("source", {})
     atom["source"]["active_srd_path"] = active_srd_path
     atom["source"]["srd_pdf_path"] = srd_pdf_path
 
-    atomic_write_json(atom_path, atom)
-
     # Fill picks (preferred broad-category picker), fallback to legacy per-category pickers.
     if has_exec("bin/core/fill_picks.py"):
-        run([os.path.join(REPO_ROOT, "bin/core/fill_picks.py")])
+        atom = run_atom_step("bin/core/fill_picks.py", atom, atom_path)
     else:
         for picker in pickers_for_category(atom["category"]):
             if not has_exec(picker):
                 die(f"[make_atom] missing picker executable: {picker} (chmod +x? file exists?)")
-            run([os.path.join(REPO_ROOT, picker)])
+            atom = run_atom_step(picker, atom, atom_path)
 
     # Attach fact, pick style, write script
     for step in ["bin/core/attach_fact.py", "bin/core/pick_style.py", "bin/core/write_script_from_fact.py"]:
         if not has_exec(step):
             die(f"[make_atom] missing step executable: {step}")
-        run([os.path.join(REPO_ROOT, step)])
+        atom = run_atom_step(step, atom, atom_path)
 
-    # Validate and route atom
-    atom = load_json(atom_path)
+    # Validate and route atom (its only write after the steps, which passed it in memory)
     ok, msg = minimal_validate(atom)
     if ok:
-        dst = safe_move(atom_path, VALID_DIR)
+        dst = route_atom(atom, atom_path, VALID_DIR)
         print(dst)
         return
 
     # On failure: mark and move to failed
     atom.setdefault("errors", [])
     atom["errors"].append({
-        "at": datetime.now(UTC).isoformat(timespec="seconds").replace("+00:00","Z"),
+        # failure time, not run start: the pipeline steps can take a while
+        "at": utc_iso(datetime.now(UTC)),
         "error": msg
     })
-    atomic_write_json(atom_path, atom)
-    dst = safe_move(atom_path, FAILED_DIR)
+    dst = route_atom(atom, atom_path, FAILED_DIR)
     die(f"[make_atom] validation failed: {msg}\nMoved to: {dst}", 2)
 
+def main():
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Create and validate daily atom")
+    ap.add_argument("--day", action="append", default=[],
+                    help="Target day YYYY-MM-DD (default: BIZZAL_DAY or today); repeat to build several "
+                         "days in one process, reusing the loaded steps, configs and SRD sidecars")
+    args = ap.parse_args()
+
+    # Every --day is validated before any atom is built; each day then reads the clock itself,
+    # so created_at matches what one invocation per day under set -e would have stamped.
+    days = [resolve_day(d, datetime.now(UTC)) for d in (args.day or [""])]
+    for day in days:
+        make_day_atom(day, datetime.now(UTC))
+
 if __name__ == "__main__":
     main()
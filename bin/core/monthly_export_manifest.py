@@ -1,72 +1,111 @@
 #!/usr/bin/env python3
 import argparse
+import hashlib
+import io
 import json
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from safe_io import dump_json_bytes, replace_write_bytes
+
 
 REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
 VALIDATED_DIR = os.path.join(REPO_ROOT, "data", "atoms", "validated")
 OUT_ROOT = os.path.join(REPO_ROOT, "data", "archive", "monthly")
+PARALLEL_MIN_FILES = 8
+# Tags every fallback-derived entry carries.
+_BASE_TAGS = frozenset(("content_press", "shorts"))
 
 
 def sha256_text(s: str) -> str:
-    import hashlib
     return hashlib.sha256(s.encode("utf-8")).hexdigest()
 
 
+def _sha_hex(*parts: str) -> str:
+    h = hashlib.sha256()
+    for p in parts:
+        h.update(p.encode("utf-8"))
+    return h.hexdigest()
+
+
+def segment_ids(content_id: str) -> dict:
+    # sha256(content_id + suffix) for all nine ids: hash the shared prefix once, then copy its state.
+    base = hashlib.sha256(content_id.encode("utf-8"))
+    out = {}
+    for name in ("hook", "body", "cta"):
+        ids = {}
+        for field, prefix, suffix in (
+            ("segment_id", "seg", b""),
+            ("voice_track_id", "vox", b"|voice"),
+            ("visual_asset_id", "img", b"|visual"),
+        ):
+            h = base.copy()
+            h.update(b"|" + name.encode("ascii") + suffix)
+            ids[field] = f"{prefix}-{name}-{h.hexdigest()[:10]}"
+        out[name] = ids
+    return out
+
+
+_SLUG_NONALNUM_RE = re.compile(r"[^a-zA-Z0-9]+")
+_SLUG_DASHES_RE = re.compile(r"-+")
+
+
 def slugify(s: str) -> str:
-    import re
-    txt = re.sub(r"[^a-zA-Z0-9]+", "-", (s or "").strip().lower())
-    txt = re.sub(r"-+", "-", txt).strip("-")
+    txt = _SLUG_NONALNUM_RE.sub("-", (s or "").strip().lower())
+    txt = _SLUG_DASHES_RE.sub("-", txt).strip("-")
     return txt or "na"
 
 
 def load_json(path: str):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    with open(path, "rb") as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
 
 
 def atomic_write_json(path: str, obj: dict):
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    tmp = path + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(obj, f, indent=2, ensure_ascii=False)
-        f.write("\n")
-    os.replace(tmp, path)
+    replace_write_bytes(path, dump_json_bytes(obj))
 
 
 def build_markdown(manifest: dict) -> str:
-    lines = []
-    lines.append(f"# Monthly Export Manifest — {manifest['month']}")
-    lines.append("")
-    lines.append(f"- Generated (UTC): {manifest['generated_utc']}")
-    lines.append(f"- Bundle ID: `{manifest['month_bundle_id']}`")
-    lines.append(f"- Entries: {manifest['count']}")
-    lines.append("")
-    lines.append("## Entries")
-    lines.append("")
+    buf = io.StringIO()
+    w = buf.write
+    w(f"# Monthly Export Manifest — {manifest['month']}\n")
+    w("\n")
+    w(f"- Generated (UTC): {manifest['generated_utc']}\n")
+    w(f"- Bundle ID: `{manifest['month_bundle_id']}`\n")
+    w(f"- Entries: {manifest['count']}\n")
+    w("\n")
+    w("## Entries\n")
+    w("\n")
 
     for entry in manifest.get("entries", []):
-        lines.append(f"### {entry.get('day')} — {entry.get('title')}")
-        lines.append(f"- Content ID: `{entry.get('content_id')}`")
-        lines.append(f"- Episode ID: `{entry.get('episode_id')}`")
-        lines.append(f"- Category: `{entry.get('category')}`")
-        lines.append(f"- Angle: `{entry.get('angle')}`")
-        lines.append(f"- Voice: `{entry.get('voice')}`")
-        lines.append(f"- Script ID: `{entry.get('script_id')}`")
+        w(f"### {entry.get('day')} — {entry.get('title')}\n")
+        w(f"- Content ID: `{entry.get('content_id')}`\n")
+        w(f"- Episode ID: `{entry.get('episode_id')}`\n")
+        w(f"- Category: `{entry.get('category')}`\n")
+        w(f"- Angle: `{entry.get('angle')}`\n")
+        w(f"- Voice: `{entry.get('voice')}`\n")
+        w(f"- Script ID: `{entry.get('script_id')}`\n")
         hook_seg = (entry.get("segments") or {}).get("hook") or {}
         body_seg = (entry.get("segments") or {}).get("body") or {}
         cta_seg = (entry.get("segments") or {}).get("cta") or {}
-        lines.append(
+        w(
             "- Segment IDs: "
             f"hook `{hook_seg.get('segment_id')}`, "
             f"body `{body_seg.get('segment_id')}`, "
-            f"cta `{cta_seg.get('segment_id')}`"
+            f"cta `{cta_seg.get('segment_id')}`\n"
         )
-        lines.append("")
+        w("\n")
 
-    return "\n".join(lines).rstrip() + "\n"
+    return buf.getvalue().rstrip() + "\n"
 
 
 def parse_args():
@@ -85,8 +124,8 @@ def derive_content_fallback(atom: dict) -> dict:
 
     kind = slugify(fact.get("kind") or "unknown")
     fact_pk = slugify(str(fact.get("pk") or fact.get("name") or "unknown"))
-    script_id = atom.get("script_id") or sha256_text(day + "|" + category + "|" + fact_pk)
-    canonical = sha256_text(f"{day}|{category}|{kind}|{fact_pk}|{script_id}")
+    script_id = atom.get("script_id") or _sha_hex(day, "|", category, "|", fact_pk)
+    canonical = _sha_hex(day, "|", category, "|", kind, "|", fact_pk, "|", script_id)
     short_hash = canonical[:12]
 
     content_id = f"bgp-{day}-{category}-{kind}-{fact_pk}-{short_hash}"
@@ -96,24 +135,51 @@ def derive_content_fallback(atom: dict) -> dict:
         "month_id": month_id,
         "month_bundle_id": f"zine-{month_id}-{sha256_text(month_id)[:8]}",
         "script_id": script_id,
+        "segments": segment_ids(content_id),
+        "tags": sorted(_BASE_TAGS.union((month_id, category, angle, kind, slugify(style.get("voice") or "friendly-vet")))),
+    }
+
+
+def manifest_entry(atom: dict) -> dict:
+    content = atom.get("content") or {}
+    if not content.get("content_id"):
+        content = derive_content_fallback(atom)
+    script = atom.get("script") or {}
+    fact = atom.get("fact") or {}
+    style = atom.get("style") or {}
+
+    segments = content.get("segments") or {}
+    return {
+        "day": atom.get("day"),
+        "content_id": content.get("content_id"),
+        "episode_id": content.get("episode_id"),
+        "month_bundle_id": content.get("month_bundle_id"),
+        "category": atom.get("category"),
+        "angle": atom.get("angle"),
+        "voice": style.get("voice"),
+        "script_id": atom.get("script_id"),
+        "title": fact.get("name") or fact.get("kind") or "Untitled",
+        "hook": script.get("hook", ""),
+        "body": script.get("body", ""),
+        "cta": script.get("cta", ""),
         "segments": {
             "hook": {
-                "segment_id": f"seg-hook-{sha256_text(content_id + '|hook')[:10]}",
-                "voice_track_id": f"vox-hook-{sha256_text(content_id + '|hook|voice')[:10]}",
-                "visual_asset_id": f"img-hook-{sha256_text(content_id + '|hook|visual')[:10]}",
+                "segment_id": (segments.get("hook") or {}).get("segment_id"),
+                "voice_track_id": (segments.get("hook") or {}).get("voice_track_id"),
+                "visual_asset_id": (segments.get("hook") or {}).get("visual_asset_id"),
             },
             "body": {
-                "segment_id": f"seg-body-{sha256_text(content_id + '|body')[:10]}",
-                "voice_track_id": f"vox-body-{sha256_text(content_id + '|body|voice')[:10]}",
-                "visual_asset_id": f"img-body-{sha256_text(content_id + '|body|visual')[:10]}",
+                "segment_id": (segments.get("body") or {}).get("segment_id"),
+                "voice_track_id": (segments.get("body") or {}).get("voice_track_id"),
+                "visual_asset_id": (segments.get("body") or {}).get("visual_asset_id"),
             },
             "cta": {
-                "segment_id": f"seg-cta-{sha256_text(content_id + '|cta')[:10]}",
-                "voice_track_id": f"vox-cta-{sha256_text(content_id + '|cta|voice')[:10]}",
-                "visual_asset_id": f"img-cta-{sha256_text(content_id + '|cta|visual')[:10]}",
+                "segment_id": (segments.get("cta") or {}).get("segment_id"),
+                "voice_track_id": (segments.get("cta") or {}).get("voice_track_id"),
+                "visual_asset_id": (segments.get("cta") or {}).get("visual_asset_id"),
             },
         },
-        "tags": sorted({month_id, category, angle, kind, slugify(style.get("voice") or "friendly-vet"), "content_press", "shorts"}),
+        "tags": content.get("tags") or [],
     }
 
 
@@ -127,54 +193,16 @@ def main():
     if not os.path.isdir(VALIDATED_DIR):
         raise SystemExit(f"ERROR: missing validated dir: {VALIDATED_DIR}")
 
-    entries = []
-    for fname in sorted(os.listdir(VALIDATED_DIR)):
-        if not fname.endswith(".json"):
-            continue
-        if not fname.startswith(month + "-"):
-            continue
-
-        atom = load_json(os.path.join(VALIDATED_DIR, fname))
-        content = atom.get("content") or {}
-        if not content.get("content_id"):
-            content = derive_content_fallback(atom)
-        script = atom.get("script") or {}
-        fact = atom.get("fact") or {}
-        style = atom.get("style") or {}
-
-        segments = content.get("segments") or {}
-        entries.append({
-            "day": atom.get("day"),
-            "content_id": content.get("content_id"),
-            "episode_id": content.get("episode_id"),
-            "month_bundle_id": content.get("month_bundle_id"),
-            "category": atom.get("category"),
-            "angle": atom.get("angle"),
-            "voice": style.get("voice"),
-            "script_id": atom.get("script_id"),
-            "title": fact.get("name") or fact.get("kind") or "Untitled",
-            "hook": script.get("hook", ""),
-            "body": script.get("body", ""),
-            "cta": script.get("cta", ""),
-            "segments": {
-                "hook": {
-                    "segment_id": (segments.get("hook") or {}).get("segment_id"),
-                    "voice_track_id": (segments.get("hook") or {}).get("voice_track_id"),
-                    "visual_asset_id": (segments.get("hook") or {}).get("visual_asset_id"),
-                },
-                "body": {
-                    "segment_id": (segments.get("body") or {}).get("segment_id"),
-                    "voice_track_id": (segments.get("body") or {}).get("voice_track_id"),
-                    "visual_asset_id": (segments.get("body") or {}).get("visual_asset_id"),
-                },
-                "cta": {
-                    "segment_id": (segments.get("cta") or {}).get("segment_id"),
-                    "voice_track_id": (segments.get("cta") or {}).get("voice_track_id"),
-                    "visual_asset_id": (segments.get("cta") or {}).get("visual_asset_id"),
-                },
-            },
-            "tags": content.get("tags") or [],
-        })
+    with os.scandir(VALIDATED_DIR) as it:
+        files = sorted(e.path for e in it if e.name.endswith(".json") and e.name.startswith(month + "-"))
+
+    # Independent files: overlap the reads for year-scale rebuilds; small months stay serial.
+    if len(files) < PARALLEL_MIN_FILES:
+        atoms = [load_json(p) for p in files]
+    else:
+        with ThreadPoolExecutor(max_workers=min(32, len(files))) as ex:
+            atoms = list(ex.map(load_json, files))
+    entries = [manifest_entry(atom) for atom in atoms]
 
     entries.sort(key=lambda e: e.get("day") or "")
     bundle_id = entries[0].get("month_bundle_id") if entries else f"zine-{month}-pending"
@@ -194,7 +222,7 @@ def main():
     md_out = os.path.join(out_dir, "manifest.md")
 
     atomic_write_json(json_out, manifest)
-    with open(md_out, "w", encoding="utf-8") as f:
+    with open(md_out, "w", encoding="utf-8", buffering=1 << 20) as f:
         f.write(build_markdown(manifest))
 
     print(json_out)
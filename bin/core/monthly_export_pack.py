@@ -2,24 +2,33 @@
 import argparse
 import csv
 import hashlib
+import io
 import json
 import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
 MONTHLY_ROOT = os.path.join(REPO_ROOT, "data", "archive", "monthly")
 
 
 def load_json(path: str):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    with open(path, "rb") as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
 
 
 def parse_args():
     ap = argparse.ArgumentParser(description="Generate zine pack files from monthly manifest.")
     ap.add_argument("--month", default=datetime.now().strftime("%Y-%m"), help="Month in YYYY-MM format")
     ap.add_argument("--manifest", default="", help="Optional explicit manifest.json path")
+    ap.add_argument("--all", action="store_true", help="Rebuild the pack for every month that has a manifest")
     return ap.parse_args()
 
 
@@ -50,34 +59,35 @@ def segment_record(entry: dict, segment_name: str, raw_segment):
 
 
 def write_content_md(out_path: str, manifest: dict):
-    lines = []
-    lines.append(f"# Bizzal Monthly Zine Draft — {manifest.get('month')}")
-    lines.append("")
-    lines.append(f"Bundle ID: {manifest.get('month_bundle_id')}")
-    lines.append(f"Entries: {manifest.get('count')}")
-    lines.append("")
+    buf = io.StringIO()
+    w = buf.write
+    w(f"# Bizzal Monthly Zine Draft — {manifest.get('month')}\n")
+    w("\n")
+    w(f"Bundle ID: {manifest.get('month_bundle_id')}\n")
+    w(f"Entries: {manifest.get('count')}\n")
+    w("\n")
 
     for idx, entry in enumerate(manifest.get("entries", []), start=1):
-        lines.append(f"## {idx}. {entry.get('title')} ({entry.get('day')})")
-        lines.append("")
-        lines.append(f"- Content ID: {entry.get('content_id')}")
-        lines.append(f"- Episode ID: {entry.get('episode_id')}")
-        lines.append(f"- Category: {entry.get('category')}")
-        lines.append(f"- Angle: {entry.get('angle')}")
-        lines.append(f"- Voice: {entry.get('voice')}")
-        lines.append("")
-        lines.append("### Hook")
-        lines.append(entry.get("hook") or "")
-        lines.append("")
-        lines.append("### Body")
-        lines.append(entry.get("body") or "")
-        lines.append("")
-        lines.append("### CTA")
-        lines.append(entry.get("cta") or "")
-        lines.append("")
-
-    with open(out_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(lines).rstrip() + "\n")
+        w(f"## {idx}. {entry.get('title')} ({entry.get('day')})\n")
+        w("\n")
+        w(f"- Content ID: {entry.get('content_id')}\n")
+        w(f"- Episode ID: {entry.get('episode_id')}\n")
+        w(f"- Category: {entry.get('category')}\n")
+        w(f"- Angle: {entry.get('angle')}\n")
+        w(f"- Voice: {entry.get('voice')}\n")
+        w("\n")
+        w("### Hook\n")
+        w((entry.get("hook") or "") + "\n")
+        w("\n")
+        w("### Body\n")
+        w((entry.get("body") or "") + "\n")
+        w("\n")
+        w("### CTA\n")
+        w((entry.get("cta") or "") + "\n")
+        w("\n")
+
+    with open(out_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        f.write(buf.getvalue().rstrip() + "\n")
 
 
 def write_assets_csv(out_path: str, manifest: dict):
@@ -96,37 +106,41 @@ def write_assets_csv(out_path: str, manifest: dict):
         "visual_asset_id",
     ]
 
+    month = manifest.get("month")
+    bundle_id = manifest.get("month_bundle_id")
+
     with open(out_path, "w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fields)
-        writer.writeheader()
+        # Plain writer + tuples in `fields` order: no per-row dict; None still writes as "".
+        writer = csv.writer(f)
+        writer.writerow(fields)
 
         for entry in manifest.get("entries", []):
             segments = entry.get("segments") or {}
+            head = (
+                month,
+                bundle_id,
+                entry.get("day"),
+                entry.get("content_id"),
+                entry.get("episode_id"),
+                entry.get("title"),
+                entry.get("category"),
+                entry.get("angle"),
+            )
             for segment_name in ("hook", "body", "cta"):
                 seg = segment_record(entry, segment_name, segments.get(segment_name))
                 writer.writerow(
-                    {
-                        "month": manifest.get("month"),
-                        "month_bundle_id": manifest.get("month_bundle_id"),
-                        "day": entry.get("day"),
-                        "content_id": entry.get("content_id"),
-                        "episode_id": entry.get("episode_id"),
-                        "title": entry.get("title"),
-                        "category": entry.get("category"),
-                        "angle": entry.get("angle"),
-                        "segment": segment_name,
-                        "segment_id": seg.get("segment_id"),
-                        "voice_track_id": seg.get("voice_track_id"),
-                        "visual_asset_id": seg.get("visual_asset_id"),
-                    }
+                    head + (segment_name, seg.get("segment_id"), seg.get("voice_track_id"), seg.get("visual_asset_id"))
                 )
 
 
-def main():
-    args = parse_args()
-    month = args.month
-    manifest_path = args.manifest or manifest_path_for_month(month)
+def months_with_manifest() -> list[str]:
+    if not os.path.isdir(MONTHLY_ROOT):
+        return []
+    with os.scandir(MONTHLY_ROOT) as it:
+        return sorted(e.name for e in it if e.is_dir() and os.path.isfile(manifest_path_for_month(e.name)))
+
 
+def build_pack(month: str, manifest_path: str) -> tuple[str, str]:
     if not os.path.exists(manifest_path):
         raise SystemExit(f"ERROR: manifest not found: {manifest_path}")
 
@@ -139,9 +153,29 @@ def main():
 
     write_content_md(content_md, manifest)
     write_assets_csv(assets_csv, manifest)
+    return content_md, assets_csv
+
+
+def main():
+    args = parse_args()
+
+    if args.all:
+        if args.manifest:
+            raise SystemExit("ERROR: --manifest and --all are mutually exclusive")
+        months = months_with_manifest()
+        paths = [manifest_path_for_month(m) for m in months]
+        # Months are independent: fan year-scale rebuilds out across cores; map() keeps month order.
+        if len(months) > 1:
+            with ProcessPoolExecutor(max_workers=min(len(months), os.cpu_count() or 1)) as ex:
+                outputs = list(ex.map(build_pack, months, paths))
+        else:
+            outputs = [build_pack(m, p) for m, p in zip(months, paths)]
+    else:
+        outputs = [build_pack(args.month, args.manifest or manifest_path_for_month(args.month))]
 
-    print(content_md)
-    print(assets_csv)
+    for content_md, assets_csv in outputs:
+        print(content_md)
+        print(assets_csv)
 
 
 if __name__ == "__main__":
@@ -8,7 +8,15 @@ except ImportError:
     print("ERROR: Missing PyYAML. Install with: python3 -m pip install --user pyyaml", file=sys.stderr)
     sys.exit(2)
 
-from reference_paths import resolve_active_srd_path
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from build_srd_index import load_pks
+from creature_filters import moral_choice_pks
+from reference_paths import load_yaml_file, resolve_active_srd_path
+from safe_io import dump_json_bytes, replace_write_bytes
 
 REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
 REF_CFG  = os.path.join(REPO_ROOT, "config", "reference_sources.yaml")
@@ -22,56 +30,18 @@ def atom_path(day: str) -> str:
     return os.path.join(REPO_ROOT, "data", "atoms", "incoming", day + ".json")
 
 def load_json(p):
-    with open(p, "r", encoding="utf-8") as f:
-        return json.load(f)
+    with open(p, "rb") as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
 
 def atomic_write_json(p, obj):
-    tmp = p + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(obj, f, indent=2, ensure_ascii=False); f.write("\n")
-    os.replace(tmp, p)
+    replace_write_bytes(p, dump_json_bytes(obj))
 
 def load_yaml(p):
-    with open(p, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
-
-def parse_cr(value) -> float:
-    if value is None:
-        return 0.0
-    s = str(value).strip().lower()
-    if not s:
-        return 0.0
-    try:
-        if "/" in s:
-            a, b = s.split("/", 1)
-            return float(a) / float(b)
-        return float(s)
-    except Exception:
-        return 0.0
-
-def weak_moral_choice_candidate(rec: dict) -> bool:
-    fields = (rec or {}).get("fields") or {}
-    name = str(fields.get("name") or "").strip().lower()
-    ctype = str(fields.get("type") or fields.get("creature_type") or "").strip().lower()
-    cr = parse_cr(fields.get("challenge_rating") or fields.get("cr"))
-
-    mundane_mount_tokens = (
-        "riding horse", "draft horse", "pony", "mule", "donkey", "camel", "ox", "goat", "mastiff"
-    )
-    high_fantasy_exceptions = ("nightmare", "pegasus", "unicorn")
-
-    if any(tok in name for tok in mundane_mount_tokens) and not any(tok in name for tok in high_fantasy_exceptions):
-        return True
-    if ctype in ("beast", "animal") and cr <= 0.25:
-        return True
-    if cr == 0.0:
-        return True
-    return False
+    return load_yaml_file(p)
 
-def main():
+def run(atom: dict) -> dict:
     day = resolve_day()
-    path = atom_path(day)
-    atom = load_json(path)
     cat = atom.get("category")
     if cat not in ("monster_tactic", "encounter_seed"):
         print(f"ERROR: pick_creature only supports monster_tactic/encounter_seed, got {cat}", file=sys.stderr)
@@ -82,27 +52,26 @@ def main():
         print(f"ERROR: Bad active_srd_path in {REF_CFG}: {active_dir}", file=sys.stderr)
         sys.exit(2)
     creatures_file = (cfg.get("sources", {}).get("creatures") or {}).get("file", "Creature.json")
-    path = os.path.join(active_dir, creatures_file)
-
-    records = load_json(path)
-    pks = [r.get("pk") for r in records if isinstance(r, dict) and r.get("pk") is not None]
+    src_path = os.path.join(active_dir, creatures_file)
 
+    # One sidecar list per run; the full pk list is only the fallback for an empty moral_choice filter.
     angle = (atom.get("angle") or "").strip().lower()
+    pks = None
     if cat == "encounter_seed" and angle == "moral_choice":
-        filtered = [
-            r.get("pk") for r in records
-            if isinstance(r, dict) and r.get("pk") is not None and not weak_moral_choice_candidate(r)
-        ]
-        if filtered:
-            pks = filtered
+        pks = moral_choice_pks(src_path)
+    if not pks:
+        pks = load_pks(src_path)
 
     random.seed(f"{day}|{cat}|creature")
     pk = random.choice(pks)
 
     atom.setdefault("picks", {})
     atom["picks"]["creature_pk"] = pk
+    return atom
 
-    atomic_write_json(path, atom)
+def main():
+    path = atom_path(resolve_day())
+    atomic_write_json(path, run(load_json(path)))
     print(path)
 
 if __name__ == "__main__":
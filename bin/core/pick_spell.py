@@ -8,7 +8,14 @@ except ImportError:
     print("ERROR: Missing PyYAML. Install with: python3 -m pip install --user pyyaml", file=sys.stderr)
     sys.exit(2)
 
-from reference_paths import resolve_active_srd_path
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from build_srd_index import load_pks
+from reference_paths import load_yaml_file, resolve_active_srd_path
+from safe_io import dump_json_bytes, replace_write_bytes
 
 REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
 REF_CFG  = os.path.join(REPO_ROOT, "config", "reference_sources.yaml")
@@ -22,23 +29,18 @@ def atom_path(day: str) -> str:
     return os.path.join(REPO_ROOT, "data", "atoms", "incoming", day + ".json")
 
 def load_json(p):
-    with open(p, "r", encoding="utf-8") as f:
-        return json.load(f)
+    with open(p, "rb") as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
 
 def atomic_write_json(p, obj):
-    tmp = p + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(obj, f, indent=2, ensure_ascii=False); f.write("\n")
-    os.replace(tmp, p)
+    replace_write_bytes(p, dump_json_bytes(obj))
 
 def load_yaml(p):
-    with open(p, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    return load_yaml_file(p)
 
-def main():
+def run(atom: dict) -> dict:
     day = resolve_day()
-    path = atom_path(day)
-    atom = load_json(path)
     cat = atom.get("category")
     if cat != "spell_use_case":
         print(f"ERROR: pick_spell only supports spell_use_case, got {cat}", file=sys.stderr)
@@ -49,17 +51,20 @@ def main():
         print(f"ERROR: Bad active_srd_path in {REF_CFG}: {active_dir}", file=sys.stderr)
         sys.exit(2)
     spell_file = (cfg.get("sources", {}).get("spells") or {}).get("file", "Spell.json")
-    path = os.path.join(active_dir, spell_file)
+    src_path = os.path.join(active_dir, spell_file)
 
-    records = load_json(path)
-    pks = [r.get("pk") for r in records if isinstance(r, dict) and r.get("pk") is not None]
+    pks = load_pks(src_path)
 
     random.seed(f"{day}|{cat}|spell")
     pk = random.choice(pks)
 
     atom.setdefault("picks", {})
     atom["picks"]["spell_pk"] = pk
-    atomic_write_json(path, atom)
+    return atom
+
+def main():
+    path = atom_path(resolve_day())
+    atomic_write_json(path, run(load_json(path)))
     print(path)
 
 if __name__ == "__main__":
@@ -8,10 +8,19 @@ except ImportError:
     print("ERROR: Missing PyYAML. Install with: python3 -m pip install --user pyyaml", file=sys.stderr)
     sys.exit(2)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from reference_paths import load_yaml_file
+from safe_io import dump_json_bytes, replace_write_bytes
+
 REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
 CFG_PATH  = os.path.join(REPO_ROOT, "config", "style_rules.yaml")
 STATE_DIR = os.path.join(REPO_ROOT, "runtime", "state")
 HIST_PATH = os.path.join(STATE_DIR, "style_history.json")
+HIST_BACKFILL_DAYS = 60
 
 
 def resolve_day() -> str:
@@ -25,18 +34,15 @@ def atom_path(day: str) -> str:
     return os.path.join(REPO_ROOT, "data", "atoms", "incoming", day + ".json")
 
 def load_json(p):
-    with open(p, "r", encoding="utf-8") as f:
-        return json.load(f)
+    with open(p, "rb") as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
 
-def atomic_write_json(p, obj):
-    tmp = p + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(obj, f, indent=2, ensure_ascii=False); f.write("\n")
-    os.replace(tmp, p)
+def atomic_write_json(p, obj, compact: bool = False):
+    replace_write_bytes(p, dump_json_bytes(obj, compact=compact))
 
 def load_yaml(p):
-    with open(p, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    return load_yaml_file(p)
 
 def load_history():
     if not os.path.exists(HIST_PATH):
@@ -44,6 +50,21 @@ def load_history():
     return load_json(HIST_PATH)
 
 
+# A day's pick reads back its yesterday and its tone lookback window. Pruning is anchored on the
+# newest recorded day, not the day being written, and keeps HIST_BACKFILL_DAYS on top of that
+# window: re-running any day within HIST_BACKFILL_DAYS of the newest (make_atom --day backfills)
+# still sees the history it was first built with. Older days are dropped so the file
+# (machine-read only, hence compact) stays bounded.
+def prune_history(hist: dict, lookback_days: int) -> dict:
+    try:
+        newest = datetime.strptime(max(hist), "%Y-%m-%d")
+    except ValueError:
+        return hist
+    keep = HIST_BACKFILL_DAYS + max(lookback_days, 1)
+    cutoff = (newest - timedelta(days=keep)).strftime("%Y-%m-%d")
+    return {d: v for d, v in hist.items() if d >= cutoff}
+
+
 def recent_tones_for_category(hist: dict, category: str, day: str, lookback_days: int) -> list[str]:
     if lookback_days <= 0:
         return []
@@ -70,8 +91,8 @@ def pick_tts_voice(day: str, category: str, tone: str, style_voice: str, voiceov
         clean = [str(v).strip() for v in pool if str(v).strip()]
         if clean:
             seed = f"tts|{day}|{category}|{tone}|{style_voice}"
-            digest = hashlib.sha256(seed.encode("utf-8")).hexdigest()
-            idx = int(digest[:8], 16) % len(clean)
+            # First 4 digest bytes == int(hexdigest[:8], 16); keeps every day's voice unchanged.
+            idx = int.from_bytes(hashlib.sha256(seed.encode("utf-8")).digest()[:4], "big") % len(clean)
             return clean[idx]
 
     direct = str(voiceover_cfg.get("tts_voice_id") or "").strip()
@@ -80,13 +101,8 @@ def pick_tts_voice(day: str, category: str, tone: str, style_voice: str, voiceov
 
     return base_default
 
-def main():
+def run(atom: dict) -> dict:
     day = resolve_day()
-    path = atom_path(day)
-
-    if not os.path.exists(path):
-        print(f"ERROR: Atom not found: {path}", file=sys.stderr)
-        sys.exit(3)
 
     cfg = load_yaml(CFG_PATH) or {}
     defaults = cfg.get("defaults") or {}
@@ -96,7 +112,6 @@ def main():
     voiceover_by_tone = cfg.get("voiceover_by_tone") or {}
     voiceover_by_voice = cfg.get("voiceover_by_voice") or {}
 
-    atom = load_json(path)
     category = atom.get("category")
     if category not in cat_rules:
         print(f"ERROR: No style rules for category: {category}", file=sys.stderr)
@@ -187,13 +202,21 @@ def main():
         "seed": f"{day}|{category}"
     }
 
-    atomic_write_json(path, atom)
-
     # update history
     hist.setdefault(day, {})
     hist[day][category] = {"angle": angle, "voice": voice, "tone": tone, "persona": persona, "spice": spice}
-    atomic_write_json(HIST_PATH, hist)
+    hist = prune_history(hist, tone_lookback_days)
+    atomic_write_json(HIST_PATH, hist, compact=True)
+    return atom
+
+def main():
+    path = atom_path(resolve_day())
+
+    if not os.path.exists(path):
+        print(f"ERROR: Atom not found: {path}", file=sys.stderr)
+        sys.exit(3)
 
+    atomic_write_json(path, run(load_json(path)))
     print(path)
 
 if __name__ == "__main__":
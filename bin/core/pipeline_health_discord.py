@@ -171,8 +171,7 @@ def save_state(path: str, obj: dict):
     os.makedirs(os.path.dirname(path), exist_ok=True)
     tmp = path + ".tmp"
     with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(obj, f, indent=2, ensure_ascii=False)
-        f.write("\n")
+        f.write(json.dumps(obj, indent=2, ensure_ascii=False) + "\n")
     os.replace(tmp, path)
 
 
@@ -1,18 +1,57 @@
 #!/usr/bin/env python3
+import copy
+import functools
 import os
+import pickle
+
+from safe_io import replace_write_bytes
 
 try:
     import yaml
 except ImportError:
     yaml = None
 
+if yaml is not None:
+    _YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def yaml_cache_path(path: str) -> str:
+    return path + ".cache.pkl"
+
+
+# Keyed on mtime/size so an edited file is re-read; callers get a private copy.
+# Across processes the parse is reused from a pickle sidecar carrying the same key.
+@functools.lru_cache(maxsize=8)
+def _load_yaml_cached(path: str, mtime_ns: int, size: int):
+    cache = yaml_cache_path(path)
+    try:
+        with open(cache, "rb") as f:
+            sig, data = pickle.load(f)
+        if sig == (mtime_ns, size):
+            return data
+    except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError):
+        pass
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.load(f, Loader=_YamlLoader)
+    try:
+        replace_write_bytes(cache, pickle.dumps(((mtime_ns, size), data), protocol=5))
+    except OSError:
+        pass  # read-only config dir; parse again next process
+    return data
+
+
+# One parse per (path, mtime, size) per process, shared by every pipeline step that runs
+# in-process (e.g. style_rules.yaml for pick_style + write_script_from_fact).
+def load_yaml_file(path: str):
+    st = os.stat(path)
+    return copy.deepcopy(_load_yaml_cached(path, st.st_mtime_ns, st.st_size))
+
 
 def load_reference_config(cfg_path: str) -> dict:
-    if not os.path.exists(cfg_path) or yaml is None:
+    if yaml is None:
         return {}
     try:
-        with open(cfg_path, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f) or {}
+        return load_yaml_file(cfg_path) or {}
     except Exception:
         return {}
 
@@ -26,9 +65,7 @@ def _normalize_path(repo_root: str, path_value: str) -> str:
     return os.path.realpath(p)
 
 
-def resolve_active_srd_path(repo_root: str, cfg_path: str) -> tuple[str, dict]:
-    cfg = load_reference_config(cfg_path)
-
+def _active_srd_path(repo_root: str, cfg) -> str:
     env_override = (
         os.getenv("BIZZAL_ACTIVE_SRD_PATH")
         or os.getenv("BG_ACTIVE_SRD_PATH")
@@ -45,16 +82,13 @@ def resolve_active_srd_path(repo_root: str, cfg_path: str) -> tuple[str, dict]:
     for candidate in (env_override, cfg_path_value, default_active_path, legacy_default_path):
         resolved = _normalize_path(repo_root, candidate)
         if resolved and os.path.isdir(resolved):
-            return resolved, cfg
+            return resolved
 
     # Return normalized preferred path even if missing so caller can show useful errors.
-    preferred = _normalize_path(repo_root, env_override or cfg_path_value or default_active_path)
-    return preferred, cfg
+    return _normalize_path(repo_root, env_override or cfg_path_value or default_active_path)
 
 
-def resolve_srd_pdf_path(repo_root: str, cfg_path: str) -> tuple[str, dict]:
-    cfg = load_reference_config(cfg_path)
-
+def _srd_pdf_path(repo_root: str, cfg) -> str:
     env_override = (
         os.getenv("BIZZAL_SRD_PDF_PATH")
         or os.getenv("BG_SRD_PDF_PATH")
@@ -70,7 +104,22 @@ def resolve_srd_pdf_path(repo_root: str, cfg_path: str) -> tuple[str, dict]:
     for candidate in (env_override, cfg_value, default_pdf_path):
         resolved = _normalize_path(repo_root, candidate)
         if resolved and os.path.isfile(resolved):
-            return resolved, cfg
+            return resolved
+
+    return _normalize_path(repo_root, env_override or cfg_value or default_pdf_path)
+
+
+def resolve_active_srd_path(repo_root: str, cfg_path: str) -> tuple[str, dict]:
+    cfg = load_reference_config(cfg_path)
+    return _active_srd_path(repo_root, cfg), cfg
 
-    preferred = _normalize_path(repo_root, env_override or cfg_value or default_pdf_path)
-    return preferred, cfg
+
+def resolve_srd_pdf_path(repo_root: str, cfg_path: str) -> tuple[str, dict]:
+    cfg = load_reference_config(cfg_path)
+    return _srd_pdf_path(repo_root, cfg), cfg
+
+
+# Both paths from one config load (one stat + copy instead of two).
+def resolve_srd_paths(repo_root: str, cfg_path: str) -> tuple[str, str, dict]:
+    cfg = load_reference_config(cfg_path)
+    return _active_srd_path(repo_root, cfg), _srd_pdf_path(repo_root, cfg), cfg
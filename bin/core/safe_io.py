@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+import tempfile
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# compact=True for machine-read state files: no indentation or spaces after separators.
+def dump_json_bytes(obj, compact: bool = False) -> bytes:
+    if orjson is not None:
+        opt = orjson.OPT_APPEND_NEWLINE if compact else orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE
+        return orjson.dumps(obj, option=opt)
+    if compact:
+        return (json.dumps(obj, separators=(",", ":"), ensure_ascii=False) + "\n").encode("utf-8")
+    return (json.dumps(obj, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def fsync_dir(path: str):
+    try:
+        dfd = os.open(path, os.O_DIRECTORY)
+    except (AttributeError, OSError):
+        return  # O_DIRECTORY unsupported (non-POSIX)
+    try:
+        os.fsync(dfd)
+    finally:
+        os.close(dfd)
+
+
+# Fresh temp beside `path` (same filesystem, so os.replace is atomic). mkstemp picks the name,
+# so a temp left by a crashed run can't block a later one (a pid-based name collides whenever
+# cron reuses the pid, e.g. in containers).
+def _temp_beside(path: str) -> tuple[int, str]:
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp",
+                               dir=os.path.dirname(os.path.abspath(path)))
+    if hasattr(os, "fchmod"):
+        try:
+            os.fchmod(fd, 0o644)  # mkstemp creates 0600
+        except BaseException:
+            os.close(fd)
+            os.remove(tmp)
+            raise
+    return fd, tmp
+
+
+def _write_all(fd: int, data: bytes):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def safe_write_bytes(path: str, data: bytes):
+    # Exclusive temp -> write -> fsync -> read-back SHA-256 check -> rename -> fsync parent dir.
+    # A crash leaves either the old file or the complete new one, never a truncated file.
+    fd, tmp = _temp_beside(path)
+    try:
+        try:
+            _write_all(fd, data)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+        with open(tmp, "rb") as f:
+            if hashlib.sha256(f.read()).digest() != hashlib.sha256(data).digest():
+                raise OSError(f"read-back verification failed for {tmp}")
+
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    fsync_dir(os.path.dirname(os.path.abspath(path)))
+
+
+# Plain temp -> rename for atom/state/cache writes: one open, raw os.write, one rename.
+# No fsync or read-back (see safe_write_bytes for the durable variant); the temp is removed
+# if anything fails.
+def replace_write_bytes(path: str, data: bytes):
+    fd, tmp = _temp_beside(path)
+    try:
+        try:
+            _write_all(fd, data)
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def safe_write_json(path: str, obj):
+    safe_write_bytes(path, dump_json_bytes(obj))
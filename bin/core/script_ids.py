@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+import hashlib
+
+
+# sha256 of "hook\nbody\ncta\n" (each stripped), fed to the hasher piecewise so the
+# joined script text is never built. Shared by write_script_from_fact (writer) and
+# make_atom (validator) so both sides always agree.
+def script_id_for(script: dict) -> str:
+    m = hashlib.sha256()
+    for key in ("hook", "body", "cta"):
+        m.update(script.get(key, "").strip().encode("utf-8"))
+        m.update(b"\n")
+    return m.hexdigest()
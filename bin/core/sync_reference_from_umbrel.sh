@@ -41,4 +41,7 @@ fi
 echo "[sync_ref] building inventory..."
 python3 "$REPO_ROOT/bin/core/inventory_active_srd.py"
 
+echo "[sync_ref] building pk indexes..."
+python3 "$REPO_ROOT/bin/core/build_srd_index.py"
+
 echo "[sync_ref] done"
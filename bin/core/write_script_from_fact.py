@@ -9,6 +9,10 @@ except ImportError:
     print("ERROR: Missing PyYAML. Install with: python3 -m pip install --user pyyaml", file=sys.stderr)
     sys.exit(2)
 
+from reference_paths import load_yaml_file
+from safe_io import dump_json_bytes, replace_write_bytes
+from script_ids import script_id_for
+
 REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
 STYLE_CFG = os.path.join(REPO_ROOT, "config", "style_rules.yaml")
 
@@ -18,18 +22,14 @@ def atom_path() -> str:
     return os.path.join(REPO_ROOT, "data", "atoms", "incoming", day + ".json")
 
 def load_json(p):
-    with open(p, "r", encoding="utf-8") as f:
-        return json.load(f)
+    with open(p, "rb") as f:
+        return json.loads(f.read())
 
 def load_yaml(p):
-    with open(p, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    return load_yaml_file(p)
 
 def atomic_write_json(p, obj):
-    tmp = p + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(obj, f, indent=2, ensure_ascii=False); f.write("\n")
-    os.replace(tmp, p)
+    replace_write_bytes(p, dump_json_bytes(obj))
 
 def sha256_text(s: str) -> str:
     return hashlib.sha256(s.encode("utf-8")).hexdigest()
@@ -63,7 +63,7 @@ def pick_voice_lines(style_cfg, voice_name, category, name, angle="", day=""):
     ctas  = (voice.get(ct_key) or None) or (voice.get("ctas")  or ["Use it wisely."])
 
     # deterministic pick per day+voice+category+angle+name (varies across days/topics)
-    h = int(hashlib.sha256(f"{day}|{voice_name}|{category}|{angle}|{name}".encode("utf-8")).hexdigest(), 16)
+    h = int.from_bytes(hashlib.sha256(f"{day}|{voice_name}|{category}|{angle}|{name}".encode("utf-8")).digest(), "big")
     hook = hooks[h % len(hooks)].format(name=name)
     cta  = ctas[(h // 7) % len(ctas)]
     return hook, cta
@@ -108,9 +108,12 @@ def canonical_angle(category: str, angle: str) -> str:
     return a
 
 
+_SLUG_NONALNUM_RE = re.compile(r"[^a-zA-Z0-9]+")
+_SLUG_DASHES_RE = re.compile(r"-+")
+
 def slugify(s: str) -> str:
-    txt = re.sub(r"[^a-zA-Z0-9]+", "-", (s or "").strip().lower())
-    txt = re.sub(r"-+", "-", txt).strip("-")
+    txt = _SLUG_NONALNUM_RE.sub("-", (s or "").strip().lower())
+    txt = _SLUG_DASHES_RE.sub("-", txt).strip("-")
     return txt or "na"
 
 
@@ -1077,7 +1080,7 @@ def deterministic_pick(options, seed_key: str):
     opts = [o for o in (options or []) if str(o).strip()]
     if not opts:
         return ""
-    h = int(hashlib.sha256(seed_key.encode("utf-8")).hexdigest(), 16)
+    h = int.from_bytes(hashlib.sha256(seed_key.encode("utf-8")).digest(), "big")
     return opts[h % len(opts)]
 
 
@@ -1752,10 +1755,7 @@ def enforce_encounter_cta_guard(atom: dict, fact: dict, script: dict, day: str =
 
     return script
 
-def main():
-    path = atom_path()
-    atom = load_json(path)
-
+def run(atom: dict) -> dict:
     # Always reset script so we never show stale content if generation fails
     atom["script"] = {}
 
@@ -1826,11 +1826,13 @@ def main():
     script = enforce_encounter_cta_guard(atom, fact, script, day=day)
     script = apply_low_dc_humor_lane(atom, fact, script, day=day)
 
-    full_text = f"{script.get('hook','').strip()}\n{script.get('body','').strip()}\n{script.get('cta','').strip()}\n"
-    atom["script_id"] = sha256_text(full_text)
+    atom["script_id"] = script_id_for(script)
     atom["content"] = build_content_contract(atom, atom["script_id"], script, fact, style)
+    return atom
 
-    atomic_write_json(path, atom)
+def main():
+    path = atom_path()
+    atomic_write_json(path, run(load_json(path)))
     print(path)
 
 if __name__ == "__main__":
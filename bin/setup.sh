@@ -5,4 +5,7 @@ python3 -m venv .venv
 source .venv/bin/activate
 pip install -r requirements.txt
 
+# Precompile topic_spine.yaml -> topic_spine.json (make_atom prefers the JSON copy)
+python bin/core/compile_topic_spine.py
+
 echo "Environment ready."
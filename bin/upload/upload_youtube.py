@@ -2,6 +2,7 @@
 import argparse
 import hashlib
 import json
+import mmap
 import os
 import sys
 from datetime import datetime, timezone
@@ -24,14 +25,12 @@ def utc_now() -> str:
 
 
 def sha256_file(path: Path) -> str:
-    h = hashlib.sha256()
+    # Hash the whole file as one mapped buffer: a single GIL-free update, no per-chunk Python loop.
     with path.open("rb") as f:
-        while True:
-            chunk = f.read(1024 * 1024)
-            if not chunk:
-                break
-            h.update(chunk)
-    return h.hexdigest()
+        if os.fstat(f.fileno()).st_size == 0:
+            return hashlib.sha256().hexdigest()  # empty files can't be mmapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return hashlib.sha256(mm).hexdigest()
 
 
 def publish_registry_path(repo_root: Path) -> Path:
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "bin", "core"))
+
+import build_srd_index
+
+
+class FixtureShapeTest(unittest.TestCase):
+    def fixture(self, text: str) -> str:
+        path = os.path.join(tempfile.mkdtemp(), "Monster.json")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def assert_rejected(self, path: str, message: str):
+        with self.assertRaises(SystemExit) as cm:
+            build_srd_index.load_sidecar(path)
+        self.assertEqual(str(cm.exception), f"ERROR: SRD fixture {path} {message}")
+
+    def test_empty_fixture_is_rejected_with_a_clear_error(self):
+        path = self.fixture("")
+        self.assert_rejected(path, "is not a JSON array")
+
+    def test_object_fixture_is_rejected_even_if_it_contains_a_list(self):
+        path = self.fixture(json.dumps({"results": [{"pk": "a", "fields": {}}]}))
+        self.assert_rejected(path, "is not a JSON array")
+
+    def test_truncated_array_is_rejected(self):
+        path = self.fixture('[{"pk": "a", "fields": {}}, {"pk": ')
+        with self.assertRaises(SystemExit) as cm:
+            build_srd_index.load_sidecar(path)
+        self.assertIn("is not valid JSON", str(cm.exception))
+
+    def test_array_fixture_is_indexed(self):
+        path = self.fixture('\n[{"pk": "a", "fields": {"name": "Ä"}}, {"pk": 2, "fields": {}}]\n')
+        data = build_srd_index.load_sidecar(path)
+        self.assertEqual(data["pks"], ["a", 2])
+        offset, length = data["index"]["a"]
+        with open(path, "rb") as f:
+            f.seek(offset)
+            self.assertEqual(json.loads(f.read(length))["fields"]["name"], "Ä")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "bin", "core"))
+
+import discord_publish_gate as gate
+
+DAY = "2026-10-15"
+CONTENT_ID = "bgp-2026-10-15-test"
+WEBHOOK = "https://discord.com/api/webhooks/123/abcDEF_-x"
+
+
+class PublishCrashTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        validated = os.path.join(self.root, "data", "atoms", "validated")
+        os.makedirs(validated)
+        atom = {"category": "spell_use_case", "angle": "x", "content": {"content_id": CONTENT_ID},
+                "script": {"hook": "h", "body": "b", "cta": "c"}}
+        with open(os.path.join(validated, f"{DAY}.json"), "w", encoding="utf-8") as f:
+            json.dump(atom, f)
+        self.state_path = os.path.join(self.root, "state", "gate.json")
+        self.messages = [{"id": "900", "author": {"id": "42"}, "content": "approve",
+                          "timestamp": "2099-01-01T00:00:00Z"}]
+        self.posts = []
+        patcher = mock.patch.object(gate, "http_request", self.fake_http)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fake_http(self, method, url, headers, body=None):
+        if method == "GET":
+            return json.dumps(self.messages).encode()
+        self.posts.append(json.loads(body))
+        return json.dumps({"id": str(len(self.posts))}).encode() if "wait=true" in url else b""
+
+    def state(self) -> dict:
+        with open(self.state_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def check(self):
+        return gate.check_mode(self.root, self.state_path, "tok", "1", frozenset(), WEBHOOK, True)
+
+    def test_check_killed_mid_upload_expires_and_day_can_be_requested_again(self):
+        self.assertEqual(gate.request_mode(self.root, DAY, self.state_path, WEBHOOK, False), 0)
+
+        # The check run dies while the upload runs: the entry is left "publishing".
+        with mock.patch.object(gate, "run_publish_command", side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                self.check()
+        entry = self.state()["approvals"][DAY]
+        self.assertEqual(entry["status"], "publishing")
+        self.assertTrue(entry["publishing_started_at"])
+
+        # Within the timeout it still counts as an in-flight request.
+        requests_before = len(self.posts)
+        self.assertEqual(gate.request_mode(self.root, DAY, self.state_path, WEBHOOK, False), 0)
+        self.assertEqual(len(self.posts), requests_before)
+
+        # Past the timeout the next check fails it out into the archive...
+        with mock.patch.object(gate, "PUBLISH_STALE_SECONDS", -1):
+            self.assertEqual(self.check(), 0)
+        self.assertNotIn(DAY, self.state()["approvals"])
+        archived = gate.archived_entry(gate.archive_path_for(self.state_path), DAY)
+        self.assertEqual(archived["status"], "approved_publish_failed")
+
+        # ...and a plain request (no --force) asks for the day again.
+        self.assertEqual(gate.request_mode(self.root, DAY, self.state_path, WEBHOOK, False), 0)
+        self.assertEqual(self.state()["approvals"][DAY]["status"], "pending")
+
+    def test_stale_publishing_entry_can_be_requested_without_check(self):
+        os.makedirs(os.path.dirname(self.state_path))
+        stale = {"day": DAY, "content_id": CONTENT_ID, "status": "publishing",
+                 "publishing_started_at": "2000-01-01T00:00:00Z"}
+        with open(self.state_path, "w", encoding="utf-8") as f:
+            json.dump({"approvals": {DAY: stale}}, f)
+
+        self.assertEqual(gate.request_mode(self.root, DAY, self.state_path, WEBHOOK, False), 0)
+        self.assertEqual(self.state()["approvals"][DAY]["status"], "pending")
+
+
+
+class ArchiveIndexTest(unittest.TestCase):
+    def test_lookup_uses_index_and_rebuilds_when_archive_changes(self):
+        path = os.path.join(tempfile.mkdtemp(), "gate_archive.jsonl")
+        gate.append_archive(path, [{"day": DAY, "content_id": "a", "status": "rejected"}])
+        gate.append_archive(path, [{"day": DAY, "content_id": "b", "status": "published"}])
+        self.assertEqual(gate.archived_entry(path, DAY), {"day": DAY, "content_id": "b", "status": "published"})
+
+        with mock.patch.object(gate, "_scan_archive", side_effect=AssertionError("scanned")):
+            self.assertEqual(gate.archived_entry(path, DAY)["content_id"], "b")
+
+        # Lines appended behind the gate's back change the stamp and force one rescan.
+        with open(path, "ab") as f:
+            f.write(json.dumps({"day": "2026-10-16", "content_id": "c", "status": "rejected"}).encode() + b"\n")
+        self.assertEqual(gate.archived_entry(path, "2026-10-16")["content_id"], "c")
+        self.assertIsNone(gate.archived_entry(path, "2026-10-17"))
+
+
+if __name__ == "__main__":
+    unittest.main()